@@ -0,0 +1,321 @@
+"""
+Бенчмарк алгоритмів максимального потоку на синтетичних графах.
+
+Генератори з фіксованим зерном будують логістичні (шарові), випадкові
+розріджені, решіткові та несприятливі для Едмондса-Карпа мережі заданого
+розміру. Для кожного доступного алгоритму вимірюються час, кількість
+доповнень, пікова пам'ять і статистика фаз (SolveStats); результати
+зберігаються в JSON і за потреби порівнюються з базовими.
+
+Використання:
+    python benchmark_max_flow.py --max-edges 100000 --output results.json
+    python benchmark_max_flow.py --baseline results.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from task1_max_flow import MaxFlowNetwork
+
+
+# Алгоритми, що порівнюються
+SOLVERS = ["edmonds_karp", "capacity_scaling", "dinic", "push_relabel"]
+
+# Розміри графів (кількість ребер) за замовчуванням
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6]
+
+
+def layered_network(num_edges: int, seed: int) -> Tuple[MaxFlowNetwork, str, str]:
+    """
+    Будує шарову мережу термінали -> склади -> магазини.
+
+    Args:
+        num_edges: Приблизна кількість ребер
+        seed: Зерно генератора
+
+    Returns:
+        Кортеж (мережа, джерело, стік)
+    """
+    rng = random.Random(seed)
+    network = MaxFlowNetwork()
+    warehouses = max(2, int(num_edges ** 0.5) // 2)
+    terminals = max(1, warehouses // 4)
+    stores = max(2, warehouses * 2)
+    degree = max(1, (num_edges - terminals - stores) // (2 * warehouses))
+
+    for t in range(terminals):
+        network.add_edge("Джерело", f"Термінал {t}", rng.randint(100, 1000) * degree)
+    for w in range(warehouses):
+        for t in rng.sample(range(terminals), min(terminals, degree)):
+            network.add_edge(f"Термінал {t}", f"Склад {w}", rng.randint(10, 100))
+        for s in rng.sample(range(stores), min(stores, degree)):
+            network.add_edge(f"Склад {w}", f"Магазин {s}", rng.randint(5, 50))
+    for s in range(stores):
+        network.add_edge(f"Магазин {s}", "Стік", rng.randint(10, 100))
+    return network, "Джерело", "Стік"
+
+
+def random_sparse_network(num_edges: int, seed: int) -> Tuple[MaxFlowNetwork, str, str]:
+    """
+    Будує випадковий розріджений граф із середнім степенем 4.
+
+    Args:
+        num_edges: Кількість ребер
+        seed: Зерно генератора
+
+    Returns:
+        Кортеж (мережа, джерело, стік)
+    """
+    rng = random.Random(seed)
+    network = MaxFlowNetwork()
+    num_nodes = max(3, num_edges // 4)
+    sink = num_nodes - 1
+    # Джерело та стік гарантовано мають ребра
+    for _ in range(4):
+        network.add_edge("v0", f"v{rng.randrange(1, sink)}", rng.randint(1, 100))
+        network.add_edge(f"v{rng.randrange(1, sink)}", f"v{sink}", rng.randint(1, 100))
+    for _ in range(num_edges - 8):
+        u = rng.randrange(num_nodes)
+        v = rng.randrange(num_nodes)
+        if u != v:
+            network.add_edge(f"v{u}", f"v{v}", rng.randint(1, 100))
+    return network, "v0", f"v{sink}"
+
+
+def grid_network(num_edges: int, seed: int) -> Tuple[MaxFlowNetwork, str, str]:
+    """
+    Будує решітку з ребрами вправо та вниз між кутами.
+
+    Args:
+        num_edges: Приблизна кількість ребер
+        seed: Зерно генератора
+
+    Returns:
+        Кортеж (мережа, джерело, стік)
+    """
+    rng = random.Random(seed)
+    network = MaxFlowNetwork()
+    side = max(2, int((num_edges / 2) ** 0.5))
+    for r in range(side):
+        for c in range(side):
+            if c + 1 < side:
+                network.add_edge(f"{r},{c}", f"{r},{c + 1}", rng.randint(1, 100))
+            if r + 1 < side:
+                network.add_edge(f"{r},{c}", f"{r + 1},{c}", rng.randint(1, 100))
+    return network, "0,0", f"{side - 1},{side - 1}"
+
+
+def adversarial_network(num_edges: int, seed: int) -> Tuple[MaxFlowNetwork, str, str]:
+    """
+    Будує мережу, незручну для Едмондса-Карпа.
+
+    Кожна смуга - довгий широкий ланцюжок від джерела до спільного
+    середнього шару великої ємності і далі довгим ланцюжком до стоку.
+    У другу половину смуг з джерела ведуть короткі ребра одиничної
+    ємності. Едмондс-Карп спершу доповнює кожне таке коротке ребро
+    окремо, щоразу обходячи весь граф, і лише потім - довгі шляхи через
+    середній шар. Масштабування ємностей одразу насичує широкі шляхи,
+    а Дінік обробляє шляхи однієї довжини за одну фазу.
+
+    Args:
+        num_edges: Приблизна кількість ребер
+        seed: Зерно генератора
+
+    Returns:
+        Кортеж (мережа, джерело, стік)
+    """
+    rng = random.Random(seed)
+    network = MaxFlowNetwork()
+    lanes = max(2, int((num_edges / 2.2) ** 0.5))
+    length = lanes
+    middle = 2
+    shortcuts = min(8, length)
+    wide = 2 * shortcuts + 1
+    for lane in range(lanes):
+        network.add_edge("s", f"a{lane},0", wide)
+        for k in range(length):
+            network.add_edge(f"a{lane},{k}", f"a{lane},{k + 1}", wide)
+        for m in range(middle):
+            network.add_edge(f"a{lane},{length}", f"m{m}", wide * lanes)
+            network.add_edge(f"m{m}", f"b{lane},0", wide * lanes)
+        for k in range(length):
+            network.add_edge(f"b{lane},{k}", f"b{lane},{k + 1}", wide)
+        network.add_edge(f"b{lane},{length}", "t", wide)
+        for k in rng.sample(range(1, length + 1), shortcuts):
+            network.add_edge("s", f"b{lane},{k}", 1)
+    return network, "s", "t"
+
+
+GENERATORS = {
+    "layered": layered_network,
+    "random_sparse": random_sparse_network,
+    "grid": grid_network,
+    "adversarial": adversarial_network,
+}
+
+
+def run_solver(network: MaxFlowNetwork, source: str, sink: str, solver: str) -> Dict[str, float]:
+    """
+    Запускає один алгоритм і вимірює його.
+
+    Args:
+        network: Мережа потоків
+        source: Вершина-джерело
+        sink: Вершина-стік
+        solver: Назва алгоритму
+
+    Returns:
+        Словник з потоком, часом, кількістю доповнень, піковою пам'яттю
+        та статистикою розв'язання (SolveStats.as_dict)
+    """
+    network._csr_graph()  # побудова CSR не входить у вимірювання
+
+    start = time.perf_counter()
+    context = network._context(source, sink)
+    max_flow = network._run_solver(context, solver)
+    wall_time = time.perf_counter() - start
+
+    # Лічильники та час фаз збираються окремим прогоном, щоб не впливати на wall_time
+    stats = network.solve(source, sink, solver, collect_stats=True).stats
+
+    # Пам'ять вимірюється окремим прогоном: tracemalloc сповільнює виконання
+    tracemalloc.start()
+    network._run_solver(network._context(source, sink), solver)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "max_flow": max_flow,
+        "wall_time": wall_time,
+        "augmentations": context.augmentations,
+        "peak_memory": peak,
+        "stats": stats.as_dict(),
+    }
+
+
+def run_benchmarks(
+    sizes: List[int],
+    solvers: List[str],
+    generators: List[str],
+    seed: int = 42
+) -> List[Dict]:
+    """
+    Виконує бенчмарк для всіх комбінацій генератора, розміру та алгоритму.
+
+    Args:
+        sizes: Кількості ребер
+        solvers: Назви алгоритмів
+        generators: Назви генераторів
+        seed: Зерно генераторів
+
+    Returns:
+        Список записів результатів
+    """
+    results = []
+    for generator in generators:
+        for size in sizes:
+            network, source, sink = GENERATORS[generator](size, seed)
+            flows = set()
+            for solver in solvers:
+                record = run_solver(network, source, sink, solver)
+                record.update({
+                    "generator": generator,
+                    "edges": len(network._tails),
+                    "nodes": len(network._names),
+                    "size": size,
+                    "solver": solver,
+                })
+                flows.add(record["max_flow"])
+                results.append(record)
+                print(f"{generator:<15} {size:>9} {solver:<15} "
+                      f"{record['wall_time']:>10.4f} с {record['augmentations']:>10} "
+                      f"{record['peak_memory'] / 1024:>10.0f} КБ")
+            if len(flows) > 1:
+                print(f"✗ Алгоритми дали різні потоки на {generator}/{size}: {sorted(flows)}")
+    return results
+
+
+def find_regressions(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """
+    Порівнює результати з базовими.
+
+    Args:
+        results: Поточні результати
+        baseline: Базові результати
+        tolerance: Допустиме відносне сповільнення (0.2 — на 20%)
+
+    Returns:
+        Список описів регресій
+    """
+    expected = {(r["generator"], r["size"], r["solver"]): r for r in baseline}
+    regressions = []
+    for record in results:
+        key = (record["generator"], record["size"], record["solver"])
+        base = expected.get(key)
+        if base is None:
+            continue
+        if record["max_flow"] != base["max_flow"]:
+            regressions.append(f"{'/'.join(map(str, key))}: потік {record['max_flow']} замість {base['max_flow']}")
+        if record["wall_time"] > base["wall_time"] * (1 + tolerance):
+            regressions.append(
+                f"{'/'.join(map(str, key))}: час {record['wall_time']:.4f} с "
+                f"проти {base['wall_time']:.4f} с"
+            )
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    """Головна функція бенчмарку."""
+    parser = argparse.ArgumentParser(description="Бенчмарк алгоритмів максимального потоку")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="кількості ребер синтетичних графів")
+    parser.add_argument("--max-edges", type=int, default=10**4,
+                        help="пропустити розміри, більші за це значення")
+    parser.add_argument("--solvers", nargs="+", default=SOLVERS, choices=SOLVERS)
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="файл JSON для результатів")
+    parser.add_argument("--baseline", help="файл JSON з базовими результатами")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="допустиме відносне сповільнення відносно базових результатів")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in args.sizes if size <= args.max_edges]
+
+    print("="*70)
+    print("БЕНЧМАРК АЛГОРИТМІВ МАКСИМАЛЬНОГО ПОТОКУ")
+    print("="*70)
+    results = run_benchmarks(sizes, args.solvers, args.generators, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed": args.seed,
+                "results": results,
+            }, file, ensure_ascii=False, indent=2)
+        print(f"\n✓ Результати збережено: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n✗ Виявлено регресій: {len(regressions)}")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print("\n✓ Регресій відносно базових результатів немає")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
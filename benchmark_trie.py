@@ -0,0 +1,312 @@
+"""
+Бенчмарк пам'яті та швидкості префіксного дерева.
+
+Генератори з фіксованим зерном будують набори ключів різної природи
+(короткі слова, email-адреси, URL). Для кожного набору та структури
+вимірюються пікова пам'ять побудови, пам'ять на збережений символ,
+кількість вузлів, середня кількість переходів на ключ, час додавання
+та пошуку. Колишнє розміщення вузлів (словник нащадків і __dict__ у
+кожному вузлі) вимірюється поруч із компактним TrieNode, тож «до» і
+«після» отримуються одним запуском.
+
+Використання:
+    python benchmark_trie.py --words 100000
+    python benchmark_trie.py --structures dict trie radix --generators urls
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from radix_trie import RadixTrie
+from task2_trie import Homework
+
+
+def random_words(count: int, seed: int) -> List[str]:
+    """
+    Генерує короткі слова з малих латинських літер.
+
+    Args:
+        count: Кількість слів
+        seed: Зерно генератора
+
+    Returns:
+        Список слів
+    """
+    rng = random.Random(seed)
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12)))
+            for _ in range(count)]
+
+
+def email_keys(count: int, seed: int) -> List[str]:
+    """
+    Генерує email-адреси з невеликою кількістю доменів.
+
+    Args:
+        count: Кількість адрес
+        seed: Зерно генератора
+
+    Returns:
+        Список адрес
+    """
+    rng = random.Random(seed)
+    domains = ["example.com", "mail.example.org", "company.com.ua", "university.edu"]
+    return [
+        f"{''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))}"
+        f".{rng.randint(1, 9999)}@{rng.choice(domains)}"
+        for _ in range(count)
+    ]
+
+
+def url_keys(count: int, seed: int) -> List[str]:
+    """
+    Генерує URL зі спільними префіксами схеми, хоста та шляху.
+
+    Args:
+        count: Кількість URL
+        seed: Зерно генератора
+
+    Returns:
+        Список URL
+    """
+    rng = random.Random(seed)
+    hosts = [f"https://shop{i}.example.com" for i in range(8)]
+    sections = ["catalog/products", "catalog/categories", "account/orders", "blog/posts"]
+    return [
+        f"{rng.choice(hosts)}/{rng.choice(sections)}/{rng.randint(1, 10**6)}"
+        f"?ref={''.join(rng.choice(string.ascii_lowercase) for _ in range(6))}"
+        for _ in range(count)
+    ]
+
+
+class DictTrieNode:
+    """Вузол у колишньому розміщенні: __dict__ і словник нащадків у кожному вузлі."""
+
+    def __init__(self):
+        """Ініціалізація вузла."""
+        self.children = {}
+        self.is_end_of_word = False
+        self.value = None
+        self.word_count = 0
+
+    def child_items(self):
+        """Повертає пари (символ, дочірній вузол)."""
+        return self.children.items()
+
+
+class DictTrie:
+    """Префіксне дерево на DictTrieNode з put/get як у Trie до компактних вузлів."""
+
+    def __init__(self):
+        """Ініціалізація дерева."""
+        self.root = DictTrieNode()
+
+    def put(self, key: str, value) -> None:
+        """
+        Додає ключ-значення до дерева.
+
+        Args:
+            key: Рядок-ключ
+            value: Значення для збереження
+        """
+        node = self.root
+        path = [node]
+        for char in key:
+            if char not in node.children:
+                node.children[char] = DictTrieNode()
+            node = node.children[char]
+            path.append(node)
+        if not node.is_end_of_word:
+            for visited in path:
+                visited.word_count += 1
+        node.is_end_of_word = True
+        node.value = value
+
+    def get(self, key: str):
+        """
+        Отримує значення за ключем.
+
+        Args:
+            key: Рядок-ключ
+
+        Returns:
+            Значення, якщо ключ знайдено, інакше None
+        """
+        node = self.root
+        for char in key:
+            if char not in node.children:
+                return None
+            node = node.children[char]
+        return node.value if node.is_end_of_word else None
+
+
+GENERATORS = {
+    "words": random_words,
+    "emails": email_keys,
+    "urls": url_keys,
+}
+
+STRUCTURES = {
+    "dict": DictTrie,
+    "trie": Homework,
+    "radix": RadixTrie,
+}
+
+
+def count_nodes(root) -> Tuple[int, int]:
+    """
+    Рахує вузли дерева та сумарну глибину слів.
+
+    Args:
+        root: Корінь дерева (DictTrieNode, TrieNode або RadixNode)
+
+    Returns:
+        Кортеж (кількість вузлів, сума кількостей переходів до кожного слова)
+    """
+    nodes = 0
+    hops = 0
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        nodes += 1
+        if node.is_end_of_word:
+            hops += depth
+        for _, child in node.child_items():
+            stack.append((child, depth + 1))
+    return nodes, hops
+
+
+def measure(keys: List[str], structure: str = "trie") -> Dict[str, float]:
+    """
+    Будує дерево з ключів і вимірює його.
+
+    Args:
+        keys: Ключі для додавання
+        structure: Назва структури з STRUCTURES
+
+    Returns:
+        Словник з кількістю символів, піковою пам'яттю, пам'яттю на символ,
+        кількістю вузлів, середньою кількістю переходів на ключ
+        та часом додавання й пошуку
+    """
+    factory = STRUCTURES[structure]
+    unique = set(keys)
+    characters = sum(len(key) for key in unique)
+
+    tracemalloc.start()
+    trie = factory()
+    for i, key in enumerate(keys):
+        trie.put(key, i)
+    memory, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del trie
+
+    # Час вимірюється окремо: tracemalloc сповільнює виконання
+    start = time.perf_counter()
+    trie = factory()
+    for i, key in enumerate(keys):
+        trie.put(key, i)
+    put_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        trie.get(key)
+    get_time = time.perf_counter() - start
+    nodes, hops = count_nodes(trie.root)
+
+    return {
+        "keys": len(unique),
+        "characters": characters,
+        "memory": memory,
+        "peak_memory": peak,
+        "bytes_per_char": memory / max(1, characters),
+        "nodes": nodes,
+        "hops_per_key": hops / max(1, len(unique)),
+        "put_time": put_time,
+        "get_time": get_time,
+    }
+
+
+def run_benchmarks(
+    count: int,
+    generators: List[str],
+    structures: List[str] = ("dict", "trie"),
+    seed: int = 42
+) -> List[Dict]:
+    """
+    Виконує бенчмарк для кожної комбінації генератора ключів і структури.
+
+    Args:
+        count: Кількість ключів у наборі
+        generators: Назви генераторів
+        structures: Назви структур
+        seed: Зерно генераторів
+
+    Returns:
+        Список записів результатів
+    """
+    results = []
+    for generator in generators:
+        keys = GENERATORS[generator](count, seed)
+        for structure in structures:
+            record = measure(keys, structure)
+            record.update({"generator": generator, "size": count, "structure": structure})
+            results.append(record)
+            print(f"{generator:<8} {structure:<6} {record['keys']:>8} "
+                  f"{record['memory'] / 2**20:>8.1f} МБ {record['bytes_per_char']:>7.1f} Б/симв "
+                  f"{record['nodes']:>9} вузлів {record['hops_per_key']:>6.1f} перех. "
+                  f"{record['put_time']:>7.3f} с {record['get_time']:>7.3f} с")
+    return results
+
+
+def compare_layouts(results: List[Dict]) -> List[Tuple[str, float, float]]:
+    """
+    Зіставляє пам'ять на символ колишніх і компактних вузлів.
+
+    Args:
+        results: Записи run_benchmarks
+
+    Returns:
+        Список (генератор, Б/симв до, Б/симв після) для наборів, виміряних
+        в обох розміщеннях
+    """
+    by_key = {(record["generator"], record["structure"]): record for record in results}
+    pairs = []
+    for record in results:
+        if record["structure"] != "dict":
+            continue
+        after = by_key.get((record["generator"], "trie"))
+        if after is not None:
+            pairs.append((record["generator"], record["bytes_per_char"], after["bytes_per_char"]))
+    return pairs
+
+
+def main(argv: List[str] = None) -> int:
+    """Головна функція бенчмарку."""
+    parser = argparse.ArgumentParser(description="Бенчмарк пам'яті префіксного дерева")
+    parser.add_argument("--words", type=int, default=10**5, help="кількість ключів у наборі")
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--structures", nargs="+", default=["dict", "trie"], choices=list(STRUCTURES))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    print("="*70)
+    print("БЕНЧМАРК ПРЕФІКСНОГО ДЕРЕВА")
+    print("="*70)
+    results = run_benchmarks(args.words, args.generators, args.structures, args.seed)
+
+    pairs = compare_layouts(results)
+    if pairs:
+        print("\nКомпактні вузли TrieNode проти словника нащадків у вузлі:")
+        for generator, before, after in pairs:
+            print(f"   {generator:<8} {before:>7.1f} -> {after:>6.1f} Б/симв ({before / after:.1f}x)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""
+Незмінне префіксне дерево на подвійному масиві (double-array trie).
+
+Переходи зберігаються у двох плоских масивах цілих чисел BASE та CHECK:
+з вузла s символом з кодом c можна перейти у вузол t = BASE[s] + c, якщо
+CHECK[t] == s. Кожен перехід - це два звертання до масивів array('i')
+без словників і об'єктів вузлів, тому структура підходить для словників,
+які будуються один раз і читаються багато разів.
+"""
+
+import re
+from array import array
+from collections import deque
+from typing import Iterator, List, Optional
+
+from trie import Trie, TrieNode
+
+
+# Розмір хвоста масиву, в якому шукається база для вузлів з кількома нащадками
+BUILD_SEARCH_WINDOW = 1 << 16
+
+
+class DoubleArrayTrie:
+    """Незмінне префіксне дерево на масивах BASE/CHECK."""
+
+    def __init__(self, trie: Trie, suffix_index: Optional[bool] = None):
+        """
+        Будує подвійний масив з наявного дерева.
+
+        Args:
+            trie: Дерево Trie або Homework з ключами та значеннями
+            suffix_index: Будувати подвійний масив обернених ключів для
+                count_words_with_suffix за O(|pattern|); None - так само,
+                як у вихідному дереві
+
+        Raises:
+            TypeError: Якщо trie не є екземпляром Trie
+        """
+        if not isinstance(trie, Trie):
+            raise TypeError("Параметр trie повинен бути екземпляром Trie")
+
+        source_suffix_root = getattr(trie, "_suffix_root", None)
+        if suffix_index is None:
+            suffix_index = source_suffix_root is not None
+
+        keys = trie.keys()
+        alphabet = sorted({char for key in keys for char in key})
+        # Код 0 не використовується: перехід завжди веде за межі BASE[s]
+        self._codes = {char: code for code, char in enumerate(alphabet, 1)}
+        self._alphabet = [""] + alphabet
+        self._values = []
+        self._base, self._check, self._counts, self._value_ids = self._build(trie.root, self._values)
+
+        self._suffix_arrays = None
+        if suffix_index:
+            if source_suffix_root is None:
+                reversed_trie = Trie()
+                for key in keys:
+                    reversed_trie.put(key[::-1], True)
+                source_suffix_root = reversed_trie.root
+            base, check, counts, _ = self._build(source_suffix_root, None)
+            self._suffix_arrays = (base, check, counts)
+
+    def _build(self, root: TrieNode, values: Optional[list]):
+        """
+        Розміщує вузли дерева в масивах BASE/CHECK (обхід у ширину).
+
+        Для кожного вузла шукається найменша база, за якої всі його
+        переходи потрапляють у вільні комірки. Пошук виконує регулярний
+        вираз над картою зайнятості: для кодів нащадків c0 < c1 < ... він
+        шукає вільні байти на відстанях c1 - c0, c2 - c0, ...
+
+        Масиви доповнюються вільними комірками на розмір алфавіту, тому
+        BASE[s] + код завжди є коректним індексом.
+
+        Args:
+            root: Корінь вихідного дерева
+            values: Список для значень слів або None, якщо значення не потрібні
+
+        Returns:
+            Кортеж масивів (BASE, CHECK, кількості слів, індекси значень)
+        """
+        codes = self._codes
+        padding = len(self._alphabet)
+        base = [0] * (1 + padding)
+        check = [-1] * (1 + padding)
+        counts = [0] * (1 + padding)
+        value_ids = [-1] * (1 + padding)
+        counts[0] = root.word_count
+        used = bytearray(1 + padding)
+        used[0] = 1
+        first_free = 1
+        patterns = {}
+
+        queue = deque([(0, root)])
+        while queue:
+            state, node = queue.popleft()
+            if values is not None and node.is_end_of_word:
+                value_ids[state] = len(values)
+                values.append(node.value)
+
+            children = sorted((codes[char], child) for char, child in node.child_items())
+            if not children:
+                continue
+
+            first_free = used.find(0, first_free)
+            smallest = children[0][0]
+            start = max(first_free, smallest)
+            if len(children) == 1:
+                position = used.find(0, start)
+            else:
+                gaps = tuple(code - smallest for code, _ in children[1:])
+                pattern = patterns.get(gaps)
+                if pattern is None:
+                    pattern = patterns[gaps] = re.compile(
+                        b"\x00" + b"".join(b".{%d}\x00" % (gap - previous - 1)
+                                            for previous, gap in zip((0,) + gaps, gaps)),
+                        re.DOTALL,
+                    )
+                # Розгалуження шукаються лише в хвості масиву, щоб не сканувати
+                # щільно заповнений початок щоразу; дірки заповнюють вузли
+                # з одним нащадком. Доповнення гарантує збіг у хвості.
+                start = max(start, len(used) - BUILD_SEARCH_WINDOW)
+                position = pattern.search(used, start).start()
+            offset = position - smallest
+
+            grow = offset + children[-1][0] + 1 + padding - len(used)
+            if grow > 0:
+                used.extend(bytes(grow))
+                base.extend([0] * grow)
+                check.extend([-1] * grow)
+                counts.extend([0] * grow)
+                value_ids.extend([-1] * grow)
+
+            base[state] = offset
+            for code, child in children:
+                target = offset + code
+                used[target] = 1
+                check[target] = state
+                counts[target] = child.word_count
+                queue.append((target, child))
+
+        return array("i", base), array("i", check), array("i", counts), array("i", value_ids)
+
+    def _walk(self, base: array, check: array, key) -> int:
+        """
+        Проходить переходами за символами ключа.
+
+        Args:
+            base: Масив BASE
+            check: Масив CHECK
+            key: Послідовність символів
+
+        Returns:
+            Номер стану або -1, якщо переходу немає
+        """
+        codes = self._codes
+        state = 0
+        try:
+            for char in key:
+                target = base[state] + codes[char]
+                if check[target] != state:
+                    return -1
+                state = target
+        except KeyError:
+            return -1  # символу немає в алфавіті
+        return state
+
+    def get(self, key: str):
+        """
+        Отримує значення за ключем.
+
+        Args:
+            key: Рядок-ключ
+
+        Returns:
+            Значення, якщо ключ знайдено, інакше None
+
+        Raises:
+            TypeError: Якщо ключ не є рядком
+        """
+        if not isinstance(key, str):
+            raise TypeError("Ключ повинен бути рядком")
+
+        state = self._walk(self._base, self._check, key)
+        if state < 0 or self._value_ids[state] < 0:
+            return None
+        return self._values[self._value_ids[state]]
+
+    def contains(self, key: str) -> bool:
+        """
+        Перевіряє наявність ключа (з тією самою семантикою, що й Trie.contains).
+
+        Args:
+            key: Рядок-ключ
+
+        Returns:
+            True, якщо ключ присутній, інакше False
+        """
+        return self.get(key) is not None
+
+    def count_words_with_prefix(self, prefix: str) -> int:
+        """
+        Підраховує кількість слів із заданим префіксом за O(|prefix|).
+
+        Args:
+            prefix: Префікс для пошуку (регістрозалежний)
+
+        Returns:
+            Кількість слів з заданим префіксом
+
+        Raises:
+            TypeError: Якщо prefix не є рядком
+            ValueError: Якщо prefix є порожнім рядком
+        """
+        if not isinstance(prefix, str):
+            raise TypeError("Параметр prefix повинен бути рядком")
+
+        if not prefix:
+            raise ValueError("Параметр prefix не може бути порожнім рядком")
+
+        state = self._walk(self._base, self._check, prefix)
+        return self._counts[state] if state >= 0 else 0
+
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        Перевіряє наявність слів із заданим префіксом.
+
+        Args:
+            prefix: Префікс для пошуку (регістрозалежний)
+
+        Returns:
+            True, якщо існує хоча б одне слово з префіксом, інакше False
+
+        Raises:
+            TypeError: Якщо prefix не є рядком
+            ValueError: Якщо prefix є порожнім рядком
+        """
+        return self.count_words_with_prefix(prefix) > 0
+
+    def count_words_with_suffix(self, pattern: str) -> int:
+        """
+        Підраховує кількість слів, що закінчуються заданим суфіксом.
+
+        З індексом суфіксів відповідь дає прохід оберненим шаблоном,
+        інакше перебираються всі ключі.
+
+        Args:
+            pattern: Суфікс для пошуку (регістрозалежний)
+
+        Returns:
+            Кількість слів з заданим суфіксом
+
+        Raises:
+            TypeError: Якщо pattern не є рядком
+            ValueError: Якщо pattern є порожнім рядком
+        """
+        if not isinstance(pattern, str):
+            raise TypeError("Параметр pattern повинен бути рядком")
+
+        if not pattern:
+            raise ValueError("Параметр pattern не може бути порожнім рядком")
+
+        if self._suffix_arrays is not None:
+            base, check, counts = self._suffix_arrays
+            state = self._walk(base, check, reversed(pattern))
+            return counts[state] if state >= 0 else 0
+
+        return sum(1 for key in self if key.endswith(pattern))
+
+    def keys(self) -> List[str]:
+        """
+        Повертає список усіх ключів у порядку зростання кодів символів.
+
+        Returns:
+            Список рядків-ключів
+        """
+        return list(self)
+
+    def __iter__(self) -> Iterator[str]:
+        """Ітерує ключі в порядку зростання кодів символів (обхід у глибину)."""
+        base, check, value_ids = self._base, self._check, self._value_ids
+        alphabet = self._alphabet
+        stack = [(0, "")]
+        while stack:
+            state, prefix = stack.pop()
+            is_word = value_ids[state] >= 0
+            if is_word:
+                yield prefix
+            if self._counts[state] == is_word:
+                continue  # лист: нащадків немає
+            offset = base[state]
+            # Нащадки додаються у зворотному порядку, щоб виходити відсортованими
+            for code in range(len(alphabet) - 1, 0, -1):
+                if check[offset + code] == state:
+                    stack.append((offset + code, prefix + alphabet[code]))
+
+    def __len__(self) -> int:
+        """Повертає кількість слів."""
+        return self._counts[0]
+
+    def __contains__(self, key: str) -> bool:
+        """Перевіряє наявність ключа (див. contains)."""
+        return self.contains(key)
+
+    @property
+    def nbytes(self) -> int:
+        """Розмір масивів переходів і лічильників у байтах (без значень)."""
+        arrays = [self._base, self._check, self._counts, self._value_ids]
+        if self._suffix_arrays is not None:
+            arrays.extend(self._suffix_arrays)
+        return sum(len(data) * data.itemsize for data in arrays)
@@ -0,0 +1,250 @@
+"""
+Стиснене префіксне дерево (radix / Patricia trie).
+
+Ланцюжки вузлів з одним нащадком стискаються в одне ребро з рядковою
+міткою, тому довгі ключі зі спільними префіксами (email, URL) займають
+кілька вузлів замість одного вузла на символ. Вузли розщеплюються під час
+додавання, коли новий ключ розходиться з міткою посередині ребра.
+"""
+
+from typing import Optional
+
+
+class RadixNode:
+    """Вузол стисненого префіксного дерева."""
+
+    __slots__ = ("label", "children", "is_end_of_word", "value", "word_count")
+
+    def __init__(self, label: str = ""):
+        """
+        Ініціалізація вузла.
+
+        Args:
+            label: Мітка ребра від батьківського вузла до цього
+        """
+        self.label = label
+        self.children = None  # {перший символ мітки: вузол}, створюється на вимогу
+        self.is_end_of_word = False
+        self.value = None
+        self.word_count = 0  # кількість слів у піддереві, включно з цим вузлом
+
+    def child(self, char: str) -> Optional["RadixNode"]:
+        """
+        Повертає дочірній вузол, мітка якого починається з символу.
+
+        Args:
+            char: Перший символ мітки
+
+        Returns:
+            Дочірній вузол або None
+        """
+        return self.children.get(char) if self.children else None
+
+    def child_items(self):
+        """
+        Повертає пари (перший символ мітки, дочірній вузол) у порядку додавання.
+
+        Returns:
+            Ітерований набір пар
+        """
+        return self.children.items() if self.children else ()
+
+
+class RadixTrie:
+    """
+    Стиснене префіксне дерево з тим самим інтерфейсом, що й Trie.
+
+    put/get/contains/keys мають семантику Trie (включно з порядком keys),
+    has_prefix та count_words_with_prefix - семантику Homework.
+    """
+
+    def __init__(self):
+        """Ініціалізація дерева."""
+        self.root = RadixNode()
+
+    def put(self, key: str, value) -> None:
+        """
+        Додає ключ-значення до дерева.
+
+        Якщо ключ розходиться з міткою ребра посередині, ребро
+        розщеплюється проміжним вузлом.
+
+        Args:
+            key: Рядок-ключ
+            value: Значення для збереження
+
+        Raises:
+            TypeError: Якщо ключ не є рядком
+        """
+        if not isinstance(key, str):
+            raise TypeError("Ключ повинен бути рядком")
+
+        node = self.root
+        path = [node]
+        position = 0
+        while position < len(key):
+            child = node.child(key[position])
+            if child is None:
+                leaf = RadixNode(key[position:])
+                if node.children is None:
+                    node.children = {}
+                node.children[key[position]] = leaf
+                node = leaf
+                path.append(node)
+                break
+
+            label = child.label
+            if key.startswith(label, position):
+                node = child
+                path.append(node)
+                position += len(label)
+                continue
+
+            # Довжина спільної частини мітки та решти ключа (менша за мітку)
+            common = 1
+            while position + common < len(key) and key[position + common] == label[common]:
+                common += 1
+
+            middle = RadixNode(label[:common])
+            middle.word_count = child.word_count
+            child.label = label[common:]
+            middle.children = {child.label[0]: child}
+            node.children[key[position]] = middle
+            node = middle
+            path.append(node)
+            position += common
+
+        if not node.is_end_of_word:
+            for visited in path:
+                visited.word_count += 1
+        node.is_end_of_word = True
+        node.value = value
+
+    def _find(self, key: str) -> Optional[RadixNode]:
+        """
+        Знаходить вузол, що відповідає рівно ключу.
+
+        Args:
+            key: Рядок-ключ
+
+        Returns:
+            Вузол або None, якщо ключ закінчується не у вузлі
+        """
+        node = self.root
+        position = 0
+        while position < len(key):
+            node = node.child(key[position])
+            if node is None or not key.startswith(node.label, position):
+                return None
+            position += len(node.label)
+        return node
+
+    def get(self, key: str):
+        """
+        Отримує значення за ключем.
+
+        Args:
+            key: Рядок-ключ
+
+        Returns:
+            Значення, якщо ключ знайдено, інакше None
+
+        Raises:
+            TypeError: Якщо ключ не є рядком
+        """
+        if not isinstance(key, str):
+            raise TypeError("Ключ повинен бути рядком")
+
+        node = self._find(key)
+        return node.value if node is not None and node.is_end_of_word else None
+
+    def contains(self, key: str) -> bool:
+        """
+        Перевіряє наявність ключа в дереві.
+
+        Args:
+            key: Рядок-ключ
+
+        Returns:
+            True, якщо ключ присутній, інакше False
+        """
+        return self.get(key) is not None
+
+    def count_words_with_prefix(self, prefix: str) -> int:
+        """
+        Підраховує кількість слів із заданим префіксом.
+
+        Префікс може закінчуватися посередині мітки ребра: тоді
+        відповідь - лічильник вузла, до якого веде це ребро.
+
+        Args:
+            prefix: Префікс для пошуку (регістрозалежний)
+
+        Returns:
+            Кількість слів з заданим префіксом
+
+        Raises:
+            TypeError: Якщо prefix не є рядком
+            ValueError: Якщо prefix є порожнім рядком
+        """
+        if not isinstance(prefix, str):
+            raise TypeError("Параметр prefix повинен бути рядком")
+
+        if not prefix:
+            raise ValueError("Параметр prefix не може бути порожнім рядком")
+
+        node = self.root
+        position = 0
+        while position < len(prefix):
+            node = node.child(prefix[position])
+            if node is None:
+                return 0
+            if prefix.startswith(node.label, position):
+                position += len(node.label)
+            elif node.label.startswith(prefix[position:]):
+                break
+            else:
+                return 0
+        return node.word_count
+
+    def has_prefix(self, prefix: str) -> bool:
+        """
+        Перевіряє наявність слів із заданим префіксом.
+
+        Args:
+            prefix: Префікс для пошуку (регістрозалежний)
+
+        Returns:
+            True, якщо існує хоча б одне слово з префіксом, інакше False
+
+        Raises:
+            TypeError: Якщо prefix не є рядком
+            ValueError: Якщо prefix є порожнім рядком
+        """
+        return self.count_words_with_prefix(prefix) > 0
+
+    def keys(self) -> list:
+        """
+        Повертає список усіх ключів у дереві.
+
+        Returns:
+            Список рядків-ключів
+        """
+        result = []
+        self._collect_keys(self.root, "", result)
+        return result
+
+    def _collect_keys(self, node: RadixNode, prefix: str, result: list) -> None:
+        """
+        Рекурсивно збирає всі ключі з дерева.
+
+        Args:
+            node: Поточний вузол
+            prefix: Поточний префікс (включно з міткою вузла)
+            result: Список для збереження ключів
+        """
+        if node.is_end_of_word:
+            result.append(prefix)
+
+        for child_node in node.children.values() if node.children else ():
+            self._collect_keys(child_node, prefix + child_node.label, result)
@@ -3,121 +3,3093 @@
 Реалізація алгоритму Едмондса-Карпа для знаходження максимального потоку в мережі.
 """
 
-from collections import defaultdict, deque
-from typing import Dict, List, Tuple
+import copy
+import csv
+import hashlib
+import heapq
+import json
+import mmap
+import multiprocessing
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, TextIO, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необов'язковий: без нього працює звичайний BFS
+    np = None
+
+
+# Щільність графа (E / V·(V-1)), починаючи з якої solve(algorithm="auto")
+# обирає проштовхування передпотоку замість алгоритму Дініца
+PUSH_RELABEL_DENSITY_THRESHOLD = 0.1
+
+# Кількість вершин, починаючи з якої (за наявності NumPy) BFS розширює
+# весь фронт за раз векторними операціями замість обходу по одній вершині
+VECTORIZED_BFS_MIN_NODES = 100_000
+
+# Маркер нескінченної пропускної здатності в цілочисловому масиві ємностей
+INFINITE_CAPACITY = -1
+
+# Двійковий файл ребер: заголовок (сигнатура, кількість вершин, кількість
+# ребер), далі чотири стовпці int64 (little-endian): початки, кінці,
+# ємності, вартості
+BINARY_EDGES_MAGIC = b"MFEDGE01"
+BINARY_EDGES_HEADER = struct.Struct("<8sqq")
+
+# Знімок мережі: заголовок, таблиця назв вершин (UTF-8, розділені нульовим
+# байтом, вирівняні до 8 байтів), стовпці ребер, масиви CSR та, якщо
+# мережу розв'язано, залишкові ємності. Усі числові масиви — int64.
+SNAPSHOT_MAGIC = b"MFSNAPSH"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<8sIIqqqqqqq")
+
+# Назви допоміжних вершин, що об'єднують термінали та магазини
+SUPER_SOURCE = "Супер-Джерело"
+SUPER_SINK = "Супер-Стік"
+
+
+class CSRGraph:
+    """
+    Компактне представлення графа у форматі CSR (compressed sparse row).
+
+    Кожне ребро мережі дає дві дуги: пряму з початковою ємністю та зворотну
+    з нульовою. Дуги вершини v займають діапазон offsets[v]..offsets[v + 1],
+    rev[a] — індекс парної (зворотної) дуги для дуги a. Залишкова мережа —
+    це просто копія масиву caps. Вартість зворотної дуги протилежна прямій.
+    """
+
+    def __init__(
+        self,
+        num_nodes: int,
+        tails: array,
+        heads: array,
+        capacities: array,
+        costs: array = None
+    ):
+        """
+        Будує CSR із плоского списку ребер.
+
+        Args:
+            num_nodes: Кількість вершин
+            tails: Початкові вершини ребер
+            heads: Кінцеві вершини ребер
+            capacities: Ємності ребер (INFINITE_CAPACITY для нескінченних)
+            costs: Вартості перевезення одиниці по ребрах (за замовчуванням 0)
+        """
+        num_edges = len(tails)
+        # Нескінченну ємність замінюємо сумою скінченних плюс одиниця:
+        # жоден скінченний потік не може її перевищити
+        infinite = sum(c for c in capacities if c != INFINITE_CAPACITY) + 1
+
+        degree = [0] * (num_nodes + 1)
+        for k in range(num_edges):
+            degree[tails[k] + 1] += 1
+            degree[heads[k] + 1] += 1
+        for v in range(num_nodes):
+            degree[v + 1] += degree[v]
+
+        self.num_nodes = num_nodes
+        self.infinite = infinite
+        self.offsets = array('q', degree)
+        self.heads = array('q', bytes(8 * 2 * num_edges))
+        self.caps = array('q', bytes(8 * 2 * num_edges))
+        self.rev = array('q', bytes(8 * 2 * num_edges))
+        self.costs = array('q', bytes(8 * 2 * num_edges))
+        self.edge_arc = array('q', bytes(8 * num_edges))  # пряма дуга кожного ребра
+
+        position = degree[:num_nodes]
+        for k in range(num_edges):
+            tail, head = tails[k], heads[k]
+            capacity = capacities[k]
+            forward = position[tail]
+            position[tail] += 1
+            backward = position[head]
+            position[head] += 1
+            self.heads[forward] = head
+            self.heads[backward] = tail
+            self.caps[forward] = infinite if capacity == INFINITE_CAPACITY else capacity
+            self.rev[forward] = backward
+            self.rev[backward] = forward
+            self.edge_arc[k] = forward
+            if costs is not None:
+                self.costs[forward] = costs[k]
+                self.costs[backward] = -costs[k]
+
+
+class SolveContext:
+    """
+    Стан одного розв'язання задачі максимального потоку.
+
+    Залишкова мережа та допоміжні масиви належать контексту, а не мережі,
+    тому одна незмінна мережа може обслуговувати кілька паралельних
+    розв'язань (наприклад, з пулу потоків).
+    """
+
+    def __init__(self, csr: CSRGraph, source: int, sink: int):
+        """
+        Створює контекст із власною копією залишкових ємностей.
+
+        Args:
+            csr: CSR-представлення графа
+            source: Індекс джерела
+            sink: Індекс стоку
+        """
+        self.csr = csr
+        self.source = source
+        self.sink = sink
+        self.capacities = csr.caps  # початкові ємності дуг
+        self.residual = csr.caps[:]
+        self.parent_arc = [-1] * csr.num_nodes
+        self.visited = None  # вершини, досягнуті останнім BFS
+        # Кількість доповнень (для push-relabel — операцій проштовхування)
+        self.augmentations = 0
+        # Пошук у ширину по фронтах за допомогою NumPy (для великих графів)
+        self.vectorized = np is not None and csr.num_nodes >= VECTORIZED_BFS_MIN_NODES
+        # Інструментування вмикається лише на вимогу (див. SolveStats)
+        self.stats = None
+        self.progress = None
+
+
+class SolveStats:
+    """
+    Статистика одного розв'язання: лічильники та час фаз алгоритму.
+
+    Збирається лише тоді, коли її явно запитано (collect_stats=True або
+    progress), тому звичайні розв'язання не платять за вимірювання.
+
+    Attributes:
+        algorithm: Назва алгоритму
+        max_flow: Потік, знайдений на поточний момент
+        bfs_runs: Кількість пошуків у ширину (для push-relabel — глобальних переозначень)
+        edges_scanned: Кількість переглянутих дуг під час пошуків у ширину
+        augmenting_paths: Кількість доповнюючих шляхів
+        total_path_length: Сумарна довжина доповнюючих шляхів (у дугах)
+        pushes: Кількість операцій проштовхування (push-relabel)
+        relabels: Кількість переозначень (push-relabel)
+        phase_times: Час кожної фази в секундах
+        total_time: Загальний час розв'язання в секундах
+    """
+
+    def __init__(self, algorithm: str):
+        """
+        Створює порожню статистику.
+
+        Args:
+            algorithm: Назва алгоритму
+        """
+        self.algorithm = algorithm
+        self.max_flow = 0
+        self.bfs_runs = 0
+        self.edges_scanned = 0
+        self.augmenting_paths = 0
+        self.total_path_length = 0
+        self.pushes = 0
+        self.relabels = 0
+        self.phase_times = defaultdict(float)
+        self.total_time = 0.0
+
+    @property
+    def average_path_length(self) -> float:
+        """Середня довжина доповнюючого шляху."""
+        if not self.augmenting_paths:
+            return 0.0
+        return self.total_path_length / self.augmenting_paths
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        Повертає статистику у вигляді словника (наприклад, для JSON).
+
+        Returns:
+            Словник лічильників і часів фаз
+        """
+        return {
+            "algorithm": self.algorithm,
+            "max_flow": self.max_flow,
+            "bfs_runs": self.bfs_runs,
+            "edges_scanned": self.edges_scanned,
+            "augmenting_paths": self.augmenting_paths,
+            "average_path_length": self.average_path_length,
+            "pushes": self.pushes,
+            "relabels": self.relabels,
+            "phase_times": dict(self.phase_times),
+            "total_time": self.total_time,
+        }
+
+    def __repr__(self) -> str:
+        return (f"SolveStats(algorithm={self.algorithm!r}, max_flow={self.max_flow}, "
+                f"bfs_runs={self.bfs_runs}, edges_scanned={self.edges_scanned}, "
+                f"augmenting_paths={self.augmenting_paths}, total_time={self.total_time:.6f})")
+
+
+class FlowResult:
+    """
+    Результат розв'язання з індексами для звітів.
+
+    Потоки ребер фіксуються в момент створення, а вхідний і вихідний потоки
+    кожної вершини обчислюються за один прохід, тому запити до них
+    виконуються за O(1). Відсортовані індекси ребер будуються за потреби
+    один раз. Для сумісності результат розпаковується як кортеж
+    (максимальний потік, словник потоків[, додаткові значення]).
+
+    Attributes:
+        max_flow: Величина максимального потоку (float('inf'), якщо стік
+            досяжний шляхом з нескінченних ребер)
+        stats: Статистика розв'язання (SolveStats) або None
+        source_side: Вершини з боку джерела мінімального розрізу або None
+        cut_edges: Ребра мінімального розрізу або None
+    """
+
+    def __init__(
+        self,
+        network: "MaxFlowNetwork",
+        context: SolveContext = None,
+        max_flow: int = 0,
+        stats: SolveStats = None,
+        min_cut: Tuple[set, List[Tuple[str, str]]] = None
+    ):
+        """
+        Створює результат із залишкової мережі завершеного розв'язання.
+
+        Args:
+            network: Мережа потоків
+            context: Контекст завершеного розв'язання (None — нульовий потік)
+            max_flow: Величина максимального потоку (не менша за межу
+                нескінченних ребер — float('inf'))
+            stats: Статистика, що додається до розпакування
+            min_cut: Пара (вершини з боку джерела, ребра розрізу), що додається до розпакування
+        """
+        num_edges = len(network._tails)
+        if context is not None and max_flow >= context.csr.infinite:
+            # Потік досягає межі нескінченних ребер лише вздовж шляху з них
+            max_flow = float('inf')
+        self.max_flow = max_flow
+        self.stats = stats
+        self.source_side, self.cut_edges = min_cut if min_cut is not None else (None, None)
+        self._extras = (stats,) if stats is not None else ()
+        if min_cut is not None:
+            self._extras += min_cut
+
+        self._names = network._names[:]
+        self._index = dict(network._index)
+        self._tails = network._tails[:num_edges]
+        self._heads = network._heads[:num_edges]
+        self._caps = network._caps[:num_edges]
+        self._flows = array('q', bytes(8 * num_edges))
+        self._inflow = array('q', bytes(8 * len(self._names)))
+        self._outflow = array('q', bytes(8 * len(self._names)))
+        if context is not None:
+            capacities, residual, edge_arc = context.capacities, context.residual, context.csr.edge_arc
+            for k in range(num_edges):
+                arc = edge_arc[k]
+                flow = capacities[arc] - residual[arc]
+                if flow > 0:
+                    self._flows[k] = flow
+                    self._outflow[self._tails[k]] += flow
+                    self._inflow[self._heads[k]] += flow
+
+        self._flow_graph = None
+        self._by_capacity = None
+        self._in_edges = None
+        self._out_edges = None
+
+    def __iter__(self) -> Iterator:
+        yield self.max_flow
+        yield self.flow_graph
+        yield from self._extras
+
+    def __len__(self) -> int:
+        return 2 + len(self._extras)
+
+    def __getitem__(self, index):
+        # Як у кортежу, але flow_graph будується лише при зверненні до нього
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        position = index + len(self) if index < 0 else index
+        if position == 0:
+            return self.max_flow
+        if position == 1:
+            return self.flow_graph
+        if 2 <= position < len(self):
+            return self._extras[position - 2]
+        raise IndexError("Індекс результату поза межами")
+
+    def __repr__(self) -> str:
+        return f"FlowResult(max_flow={self.max_flow}, edges={len(self._flows)})"
+
+    @property
+    def flow_graph(self) -> Dict[str, Dict[str, int]]:
+        """Словник ненульових потоків по ребрах {від: {до: потік}}."""
+        if self._flow_graph is None:
+            names = self._names
+            flow_graph = defaultdict(dict)
+            for k, flow in enumerate(self._flows):
+                if flow > 0:
+                    neighbors = flow_graph[names[self._tails[k]]]
+                    to_node = names[self._heads[k]]
+                    neighbors[to_node] = neighbors.get(to_node, 0) + flow
+            self._flow_graph = dict(flow_graph)
+        return self._flow_graph
+
+    def inflow(self, node: str) -> int:
+        """
+        Повертає сумарний потік, що входить у вершину.
+
+        Args:
+            node: Назва вершини
+
+        Returns:
+            Вхідний потік (0 для невідомої вершини)
+        """
+        index = self._index.get(node)
+        return self._inflow[index] if index is not None else 0
+
+    def outflow(self, node: str) -> int:
+        """
+        Повертає сумарний потік, що виходить з вершини.
+
+        Args:
+            node: Назва вершини
+
+        Returns:
+            Вихідний потік (0 для невідомої вершини)
+        """
+        index = self._index.get(node)
+        return self._outflow[index] if index is not None else 0
+
+    def edges(self) -> Iterator[Tuple[str, str, int, int, float]]:
+        """
+        Перебирає всі ребра в порядку додавання.
+
+        Returns:
+            Ітератор кортежів (від, до, ємність, потік, завантаження у відсотках);
+            нескінченна ємність — float('inf') із завантаженням 0
+        """
+        for k in range(len(self._flows)):
+            yield self._edge(k)
+
+    def in_edges(self, node: str) -> List[Tuple[str, str, int, int, float]]:
+        """
+        Повертає ребра, що входять у вершину.
+
+        Args:
+            node: Назва вершини
+
+        Returns:
+            Список кортежів як у edges()
+        """
+        if self._in_edges is None:
+            self._build_adjacency()
+        return [self._edge(k) for k in self._in_edges.get(self._index.get(node), ())]
+
+    def out_edges(self, node: str) -> List[Tuple[str, str, int, int, float]]:
+        """
+        Повертає ребра, що виходять з вершини.
+
+        Args:
+            node: Назва вершини
+
+        Returns:
+            Список кортежів як у edges()
+        """
+        if self._out_edges is None:
+            self._build_adjacency()
+        return [self._edge(k) for k in self._out_edges.get(self._index.get(node), ())]
+
+    def lowest_capacity_edges(self, count: int = None) -> List[Tuple[str, str, int, int, float]]:
+        """
+        Повертає ребра скінченної ненульової ємності за її зростанням.
+
+        Args:
+            count: Кількість ребер (None — усі)
+
+        Returns:
+            Список кортежів як у edges()
+        """
+        indexes = self._capacity_index()
+        if count is not None:
+            indexes = indexes[:count]
+        return [self._edge(k) for k in indexes]
+
+    def saturated_edges(self) -> List[Tuple[str, str, int, int, float]]:
+        """
+        Повертає повністю завантажені ребра за зростанням ємності.
+
+        Returns:
+            Список кортежів як у edges()
+        """
+        return [self._edge(k) for k in self._capacity_index() if self._flows[k] == self._caps[k]]
+
+    def write_csv(self, stream: TextIO):
+        """
+        Записує звіт по ребрах у форматі CSV, рядок за рядком.
+
+        Args:
+            stream: Текстовий потік для запису (відкритий з newline="")
+        """
+        writer = csv.writer(stream)
+        writer.writerow(("from", "to", "capacity", "flow", "utilization"))
+        for from_node, to_node, capacity, flow, utilization in self.edges():
+            writer.writerow((from_node, to_node, capacity, flow, f"{utilization:.2f}"))
+
+    def write_jsonl(self, stream: TextIO):
+        """
+        Записує звіт по ребрах у форматі JSON Lines, по об'єкту на рядок.
+
+        Args:
+            stream: Текстовий потік для запису
+        """
+        for from_node, to_node, capacity, flow, utilization in self.edges():
+            stream.write(json.dumps({
+                "from": from_node,
+                "to": to_node,
+                "capacity": None if capacity == float('inf') else capacity,
+                "flow": flow,
+                "utilization": round(utilization, 2),
+            }, ensure_ascii=False))
+            stream.write("\n")
+
+    def _edge(self, k: int) -> Tuple[str, str, int, int, float]:
+        """Формує кортеж (від, до, ємність, потік, завантаження) для ребра k."""
+        capacity, flow = self._caps[k], self._flows[k]
+        if capacity == INFINITE_CAPACITY:
+            capacity, utilization = float('inf'), 0.0
+        else:
+            utilization = flow / capacity * 100 if capacity > 0 else 0.0
+        return self._names[self._tails[k]], self._names[self._heads[k]], capacity, flow, utilization
+
+    def _capacity_index(self) -> List[int]:
+        """Повертає індекси ребер скінченної ненульової ємності, відсортовані за ємністю."""
+        if self._by_capacity is None:
+            caps = self._caps
+            self._by_capacity = sorted((k for k in range(len(caps)) if caps[k] > 0), key=caps.__getitem__)
+        return self._by_capacity
+
+    def _build_adjacency(self):
+        """Будує списки вхідних і вихідних ребер вершин."""
+        self._in_edges = defaultdict(list)
+        self._out_edges = defaultdict(list)
+        for k in range(len(self._flows)):
+            self._out_edges[self._tails[k]].append(k)
+            self._in_edges[self._heads[k]].append(k)
+
+
+class FlowCache:
+    """
+    LRU-кеш результатів розв'язання з необов'язковим дисковим рівнем.
+
+    Ключ складається з хешу вмісту мережі (вершини, ребра, ємності),
+    джерела, стоку та алгоритму, тому будь-яка зміна мережі через add_edge
+    дає новий ключ, а старі записи витісняються як найдавніше використані.
+    Повернутий FlowResult спільний для всіх запитів — його не слід змінювати.
+    """
+
+    def __init__(self, max_entries: int = 128, directory: str = None):
+        """
+        Створює кеш.
+
+        Args:
+            max_entries: Максимальна кількість результатів у пам'яті
+            directory: Каталог дискового рівня (None — лише пам'ять)
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> FlowResult:
+        """
+        Шукає результат спершу в пам'яті, потім на диску.
+
+        Args:
+            key: Ключ (хеш мережі, джерело, стік, алгоритм)
+
+        Returns:
+            Збережений FlowResult або None
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+        if self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as file:
+                    result = pickle.load(file)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                result = None
+            if result is not None:
+                self._remember(key, result)
+                with self._lock:
+                    self.hits += 1
+                return result
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: tuple, result: FlowResult):
+        """
+        Зберігає результат у пам'яті та, якщо задано каталог, на диску.
+
+        Args:
+            key: Ключ (хеш мережі, джерело, стік, алгоритм)
+            result: Результат розв'язання
+        """
+        self._remember(key, result)
+        if self.directory is not None:
+            # Запис через тимчасовий файл, щоб паралельні читачі не бачили неповний файл
+            path = self._path(key)
+            temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as file:
+                pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+
+    def clear(self):
+        """Очищає рівень у пам'яті (файли на диску залишаються)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: tuple, result: FlowResult):
+        """Додає результат у пам'ять, витісняючи найдавніше використаний."""
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: tuple) -> str:
+        """Шлях до файлу результату на диску."""
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.pickle")
+
+
+def _is_header_row(fields: List[bytes]) -> bool:
+    """
+    Перевіряє, чи схожий рядок списку ребер на заголовок.
+
+    Args:
+        fields: Байтові поля рядка (щонайменше три)
+
+    Returns:
+        True, якщо жодне поле не є числом, а поле ємності — слово
+    """
+    try:
+        texts = [field.strip().decode("utf-8") for field in fields]
+    except UnicodeDecodeError:
+        return False
+    word = texts[2].replace("_", "").replace(" ", "")
+    if not word.isalpha() or word == "inf":
+        return False
+    return all(text and not text.lstrip("-").isdigit() for text in texts)
 
 
 class MaxFlowNetwork:
-    """Клас для роботи з мережею потоків."""
-    
+    """
+    Клас для роботи з мережею потоків.
+
+    Attributes:
+        result_cache: FlowCache для повторних розв'язань (None — без кешу)
+    """
+
     def __init__(self):
         """Ініціалізація мережі."""
-        self.graph = defaultdict(dict)  # граф пропускних здатностей
-        self.nodes = set()
-        
-    def add_edge(self, from_node: str, to_node: str, capacity: int):
+        # Назви вершин інтернуються в цілі індекси
+        self._names: List[str] = []
+        self._index: Dict[str, int] = {}
+        # Плоский список ребер
+        self._tails = array('q')
+        self._heads = array('q')
+        self._caps = array('q')
+        self._costs = array('q')
+        # Індекс (початок, кінець) -> ребро; None, доки не знадобиться
+        # після масового завантаження
+        self._edge_ids: Dict[Tuple[int, int], int] = {}
+        # CSR будується ліниво перед першим розв'язанням
+        self._csr = None
+        # Словник graph будується за першим зверненням
+        self._graph = None
+        self._csr_lock = threading.Lock()
+        # Хеш вмісту обчислюється ліниво й скидається при зміні мережі
+        self._content_hash = None
+        self.result_cache = None
+
+    def __getstate__(self):
+        """Стан для pickle: без блокування, кешованих CSR і graph та кешу результатів."""
+        state = self.__dict__.copy()
+        del state['_csr_lock']
+        state['_csr'] = None
+        state['_graph'] = None
+        state['result_cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Відновлює мережу з pickle."""
+        self.__dict__.update(state)
+        self._csr_lock = threading.Lock()
+
+    @property
+    def nodes(self) -> set:
+        """Множина назв вершин."""
+        return set(self._names)
+
+    @property
+    def graph(self) -> Dict[str, Dict[str, int]]:
+        """
+        Граф пропускних здатностей у вигляді вкладених словників.
+
+        Будується з внутрішніх масивів за першим зверненням і містить
+        зворотні ребра з нульовою пропускною здатністю, як і раніше.
+        Словник кешується до наступної зміни мережі й спільний для всіх
+        звертань, тому призначений лише для читання: ребра змінюються
+        через add_edge.
+        """
+        if self._graph is not None:
+            return self._graph
+        names = self._names
+        graph = defaultdict(dict)
+        for name in names:
+            graph[name] = {}
+        for k in range(len(self._tails)):
+            capacity = self._caps[k]
+            graph[names[self._tails[k]]][names[self._heads[k]]] = (
+                float('inf') if capacity == INFINITE_CAPACITY else capacity
+            )
+        for k in range(len(self._tails)):
+            graph[names[self._heads[k]]].setdefault(names[self._tails[k]], 0)
+        self._graph = graph
+        return graph
+
+    def _intern(self, name: str) -> int:
+        """
+        Повертає індекс вершини, додаючи її за потреби.
+
+        Args:
+            name: Назва вершини
+
+        Returns:
+            Цілий індекс вершини
+        """
+        node_id = self._index.get(name)
+        if node_id is None:
+            node_id = len(self._names)
+            self._index[name] = node_id
+            self._names.append(name)
+        return node_id
+
+    def add_edge(self, from_node: str, to_node: str, capacity: int, cost: int = None):
+        """
+        Додає ребро до графа.
+
+        Повторне додавання того самого ребра замінює його пропускну здатність
+        (і вартість, якщо її вказано).
+
+        Args:
+            from_node: Вихідна вершина
+            to_node: Цільова вершина
+            capacity: Пропускна здатність ребра (ціле число або float('inf'))
+            cost: Вартість перевезення одиниці товару (ціле число, за
+                замовчуванням 0 для нового ребра або попередня для наявного)
+
+        Raises:
+            ValueError: Якщо пропускна здатність від'ємна або не ціла
+        """
+        if capacity == float('inf'):
+            capacity = INFINITE_CAPACITY
+        elif capacity < 0 or capacity != int(capacity):
+            raise ValueError("Пропускна здатність повинна бути цілим невід'ємним числом або float('inf')")
+        else:
+            capacity = int(capacity)
+
+        u = self._intern(from_node)
+        v = self._intern(to_node)
+        edge_id = self._edge_id(u, v)
+        if edge_id is None:
+            self._edge_ids[(u, v)] = len(self._tails)
+            self._tails.append(u)
+            self._heads.append(v)
+            self._caps.append(capacity)
+            self._costs.append(0 if cost is None else int(cost))
+        else:
+            self._caps[edge_id] = capacity
+            if cost is not None:
+                self._costs[edge_id] = int(cost)
+        self._csr = None
+        self._graph = None
+        self._content_hash = None
+
+    def content_hash(self) -> str:
+        """
+        Обчислює стабільний хеш вмісту мережі: вершин, ребер і ємностей.
+
+        Хеш не залежить від платформи (масиви хешуються як little-endian)
+        і перераховується лише після зміни мережі.
+
+        Returns:
+            Шістнадцятковий SHA-256
+        """
+        digest = self._content_hash
+        if digest is None:
+            hasher = hashlib.sha256()
+            hasher.update("\0".join(self._names).encode("utf-8"))
+            for column in (self._tails, self._heads, self._caps):
+                if sys.byteorder == "big":
+                    column = column[:]
+                    column.byteswap()
+                hasher.update(len(column).to_bytes(8, "little"))
+                hasher.update(column.tobytes())
+            digest = hasher.hexdigest()
+            self._content_hash = digest
+        return digest
+
+    def _edge_id(self, u: int, v: int) -> int:
+        """
+        Повертає номер ребра u -> v, будуючи індекс ребер за потреби.
+
+        Args:
+            u: Індекс початкової вершини
+            v: Індекс кінцевої вершини
+
+        Returns:
+            Номер ребра або None, якщо ребра немає
+        """
+        if self._edge_ids is None:
+            self._edge_ids = {(u_, v_): k for k, (u_, v_) in enumerate(zip(self._tails, self._heads))}
+        return self._edge_ids.get((u, v))
+
+    @classmethod
+    def from_edge_list(
+        cls,
+        path: str,
+        delimiter: str = None,
+        chunk_size: int = 1 << 20
+    ) -> "MaxFlowNetwork":
+        """
+        Потоково завантажує мережу з текстового списку ребер (CSV / TSV).
+
+        Рядок: від, до, ємність[, вартість]; ємність "inf" — нескінченна.
+        Перший рядок пропускається, якщо він схожий на заголовок: жодне поле
+        не є числом, а на місці ємності стоїть слово.
+        Файл читається блоками, поля одразу потрапляють у масиви мережі;
+        назви вершин декодуються лише один раз для кожної нової вершини.
+        Повторні рядки того самого ребра об'єднуються в одне ребро:
+        ємності додаються (нескінченна поглинає решту), вартості мають
+        збігатися.
+
+        Args:
+            path: Шлях до файлу
+            delimiter: Роздільник (за замовчуванням табуляція для .tsv, інакше кома)
+            chunk_size: Розмір блоку читання в байтах
+
+        Returns:
+            Нова мережа
+
+        Raises:
+            ValueError: Якщо рядок містить менше трьох полів, некоректну
+                ємність або повторне ребро з іншою вартістю
+        """
+        if delimiter is None:
+            delimiter = "\t" if path.endswith((".tsv", ".tab")) else ","
+        separator = delimiter.encode()
+
+        network = cls()
+        network._edge_ids = None
+        tails, heads = network._tails, network._heads
+        caps, costs = network._caps, network._costs
+        ids = {}  # байтова назва -> індекс вершини
+        first_line = True
+
+        def node_id(raw: bytes) -> int:
+            """Повертає індекс вершини за байтовою назвою."""
+            found = ids.get(raw)
+            if found is None:
+                found = network._intern(raw.decode("utf-8"))
+                ids[raw] = found
+            return found
+
+        with open(path, "rb") as file:
+            pending = b""
+            while True:
+                chunk = file.read(chunk_size)
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop() if chunk else b""
+                for line in lines:
+                    fields = line.rstrip(b"\r").split(separator)
+                    if len(fields) == 1 and not fields[0].strip():
+                        continue
+                    if len(fields) < 3:
+                        raise ValueError(f"Некоректний рядок списку ребер: {line!r}")
+                    capacity = fields[2].strip()
+                    if first_line:
+                        first_line = False
+                        if _is_header_row(fields):
+                            continue
+                    if capacity == b"inf":
+                        capacity = INFINITE_CAPACITY
+                    elif capacity.isdigit():
+                        capacity = int(capacity)
+                    else:
+                        raise ValueError(f"Некоректна пропускна здатність: {line!r}")
+                    tails.append(node_id(fields[0].strip()))
+                    heads.append(node_id(fields[1].strip()))
+                    caps.append(capacity)
+                    costs.append(int(fields[3]) if len(fields) > 3 and fields[3].strip() else 0)
+                if not chunk:
+                    break
+
+        network._merge_parallel_edges()
+        return network
+
+    def _merge_parallel_edges(self):
+        """
+        Об'єднує паралельні ребра u -> v в одне ребро.
+
+        Ребра групуються сортуванням підрахунком за початковою вершиною
+        (як рядки CSR); у межах рядка повтори знаходить масив «перше ребро
+        до вершини v». Усі допоміжні дані — плоскі масиви int64 розміром
+        O(V + E), без об'єкта Python на ребро. Ємності паралельних ребер
+        додаються (нескінченна поглинає решту) в першому з них, решта
+        видаляється зі стовпців на місці зі збереженням порядку.
+
+        Raises:
+            ValueError: Якщо паралельні ребра мають різні вартості
+        """
+        num_nodes = len(self._names)
+        num_edges = len(self._tails)
+        tails, heads = self._tails, self._heads
+        caps, costs = self._caps, self._costs
+
+        offsets = array('q', bytes(8 * (num_nodes + 1)))
+        for u in tails:
+            offsets[u + 1] += 1
+        for u in range(num_nodes):
+            offsets[u + 1] += offsets[u]
+        order = array('q', bytes(8 * num_edges))
+        position = offsets[:num_nodes]
+        for k, u in enumerate(tails):
+            order[position[u]] = k
+            position[u] += 1
+        del position
+
+        # first[v] — найменший номер ребра u -> v у поточному рядку u;
+        # застарілі записи з попередніх рядків розпізнаються за tails
+        first = array('q', [-1]) * num_nodes
+        merged = 0
+        for u in range(num_nodes):
+            for k in order[offsets[u]:offsets[u + 1]]:
+                v = heads[k]
+                j = first[v]
+                if j < 0 or tails[j] != u:
+                    first[v] = k
+                    continue
+                if costs[j] != costs[k]:
+                    raise ValueError(
+                        f"Повторне ребро {self._names[u]} -> {self._names[v]} має іншу вартість"
+                    )
+                if caps[j] == INFINITE_CAPACITY or caps[k] == INFINITE_CAPACITY:
+                    caps[j] = INFINITE_CAPACITY
+                else:
+                    caps[j] += caps[k]
+                tails[k] = -1  # ребро поглинуто ребром j
+                merged += 1
+        del order, offsets, first
+        if not merged:
+            return
+
+        kept = 0
+        for k in range(num_edges):
+            if tails[k] >= 0:
+                tails[kept], heads[kept] = tails[k], heads[k]
+                caps[kept], costs[kept] = caps[k], costs[k]
+                kept += 1
+        for column in (tails, heads, caps, costs):
+            del column[kept:]
+        self._edge_ids = None
+        self._csr = None
+        self._graph = None
+        self._content_hash = None
+
+    @classmethod
+    def from_binary_edges(cls, path: str) -> "MaxFlowNetwork":
+        """
+        Завантажує мережу з двійкового файлу ребер через mmap.
+
+        Стовпці int64 копіюються в масиви мережі цілими буферами, без
+        розбору окремих ребер. Вершини у файлі задані індексами, тому
+        їх назвами стають рядки "0", "1", ... Паралельні ребра
+        об'єднуються так само, як у from_edge_list.
+
+        Args:
+            path: Шлях до файлу (формат див. to_binary_edges)
+
+        Returns:
+            Нова мережа
+
+        Raises:
+            ValueError: Якщо файл має неправильну сигнатуру чи розмір,
+                індекс вершини поза межами, від'ємну ємність (крім
+                INFINITE_CAPACITY) або паралельні ребра з різними вартостями
+        """
+        network = cls()
+        network._edge_ids = None
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if len(mapped) < BINARY_EDGES_HEADER.size:
+                    raise ValueError("Пошкоджений двійковий файл ребер")
+                magic, num_nodes, num_edges = BINARY_EDGES_HEADER.unpack_from(mapped)
+                if magic != BINARY_EDGES_MAGIC:
+                    raise ValueError("Невідомий формат двійкового файлу ребер")
+                column = 8 * num_edges
+                offset = BINARY_EDGES_HEADER.size
+                if num_nodes < 0 or num_edges < 0 or len(mapped) != offset + 4 * column:
+                    raise ValueError("Пошкоджений двійковий файл ребер")
+                view = memoryview(mapped)
+                try:
+                    for target in (network._tails, network._heads, network._caps, network._costs):
+                        target.frombytes(view[offset:offset + column])
+                        if sys.byteorder == "big":
+                            target.byteswap()
+                        offset += column
+                finally:
+                    view.release()
+
+        if num_edges:
+            for nodes in (network._tails, network._heads):
+                if min(nodes) < 0 or max(nodes) >= num_nodes:
+                    raise ValueError("Індекс вершини поза межами двійкового файлу ребер")
+            if min(network._caps) < INFINITE_CAPACITY:
+                raise ValueError("Від'ємна пропускна здатність у двійковому файлі ребер")
+
+        network._names = [str(i) for i in range(num_nodes)]
+        network._index = {name: i for i, name in enumerate(network._names)}
+        network._merge_parallel_edges()
+        return network
+
+    def to_binary_edges(self, path: str):
+        """
+        Зберігає ребра мережі у двійковий файл (індекси вершин без назв).
+
+        Args:
+            path: Шлях до файлу
+        """
+        with open(path, "wb") as file:
+            file.write(BINARY_EDGES_HEADER.pack(BINARY_EDGES_MAGIC, len(self._names), len(self._tails)))
+            for column in (self._tails, self._heads, self._caps, self._costs):
+                if sys.byteorder == "big":
+                    column = array('q', column)
+                    column.byteswap()
+                column.tofile(file)
+
+    def _csr_graph(self) -> CSRGraph:
+        """
+        Повертає CSR-представлення графа, будуючи його за потреби.
+
+        Побудова захищена блокуванням, тому паралельні розв'язання
+        отримують один і той самий незмінний об'єкт.
+
+        Returns:
+            Об'єкт CSRGraph
+        """
+        csr = self._csr
+        if csr is None:
+            with self._csr_lock:
+                csr = self._csr
+                if csr is None:
+                    csr = CSRGraph(len(self._names), self._tails, self._heads, self._caps, self._costs)
+                    self._csr = csr
+        return csr
+
+    def _context(self, source: str, sink: str) -> SolveContext:
+        """
+        Створює контекст розв'язання для пари вершин.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+
+        Returns:
+            Новий SolveContext або None, якщо вершини відсутні чи збігаються
+        """
+        if source not in self._index or sink not in self._index or source == sink:
+            return None
+        return SolveContext(self._csr_graph(), self._index[source], self._index[sink])
+
+    def bfs(self, source: str, sink: str, parent: Dict[str, str]) -> bool:
+        """
+        Пошук в ширину для знаходження шляху від джерела до стоку.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+            parent: Словник для збереження батьківських вершин
+
+        Returns:
+            True, якщо існує шлях від джерела до стоку, інакше False
+        """
+        context = self._context(source, sink)
+        if context is None:
+            return False
+
+        csr = context.csr
+        found = self._bfs(context)
+        for node, arc in enumerate(context.parent_arc):
+            if arc >= 0:
+                parent[self._names[node]] = self._names[csr.heads[csr.rev[arc]]]
+        return found
+
+    def _bfs(
+        self,
+        context: SolveContext,
+        source: int = None,
+        sink: int = None,
+        threshold: int = 1
+    ) -> bool:
+        """
+        Пошук в ширину по цілочислових індексах у залишковій мережі контексту.
+
+        Args:
+            context: Контекст розв'язання; у context.parent_arc записується
+                дуга, якою досягнуто кожну вершину
+            source: Індекс початкової вершини (за замовчуванням джерело контексту)
+            sink: Індекс цільової вершини (за замовчуванням стік контексту)
+            threshold: Мінімальна залишкова ємність дуги, що вважається
+                прохідною (Δ для масштабування ємностей)
+
+        Returns:
+            True, якщо існує шлях від джерела до стоку, інакше False
+        """
+        csr = context.csr
+        offsets, heads = csr.offsets, csr.heads
+        residual = context.residual
+        parent_arc = context.parent_arc
+        if source is None:
+            source = context.source
+        if sink is None:
+            sink = context.sink
+
+        if context.vectorized:
+            return self._bfs_vectorized(context, source, sink, threshold)
+
+        stats = context.stats
+        if stats is not None:
+            stats.bfs_runs += 1
+
+        visited = bytearray(csr.num_nodes)
+        context.visited = visited
+        visited[source] = 1
+        queue = deque([source])
+
+        while queue:
+            node = queue.popleft()
+
+            for arc in range(offsets[node], offsets[node + 1]):
+                neighbor = heads[arc]
+                if not visited[neighbor] and residual[arc] >= threshold:
+                    visited[neighbor] = 1
+                    queue.append(neighbor)
+                    parent_arc[neighbor] = arc
+                    if neighbor == sink:
+                        if stats is not None:
+                            stats.edges_scanned += arc - offsets[node] + 1
+                        return True
+
+            if stats is not None:
+                stats.edges_scanned += offsets[node + 1] - offsets[node]
+
+        return False
+
+    def _bfs_vectorized(
+        self,
+        context: SolveContext,
+        source: int,
+        sink: int,
+        threshold: int = 1
+    ) -> bool:
+        """
+        Пошук доповнюючого шляху розширенням цілих фронтів (потрібен NumPy).
+
+        Args:
+            context: Контекст розв'язання; у context.parent_arc записуються
+                дуги знайденого шляху
+            source: Індекс початкової вершини
+            sink: Індекс цільової вершини
+            threshold: Мінімальна залишкова ємність прохідної дуги
+
+        Returns:
+            True, якщо існує шлях від джерела до стоку, інакше False
+        """
+        csr = context.csr
+        if context.stats is not None:
+            context.stats.bfs_runs += 1
+        level, parent = self._frontier_bfs(context, source, sink, threshold)
+        context.visited = bytearray((level >= 0).view(np.uint8).tobytes())
+        if level[sink] < 0:
+            return False
+
+        # Переносимо лише дуги шляху до стоку
+        heads, rev = csr.heads, csr.rev
+        parent_arc = context.parent_arc
+        node = sink
+        while node != source:
+            arc = int(parent[node])
+            parent_arc[node] = arc
+            node = heads[rev[arc]]
+        return True
+
+    def _frontier_bfs(
+        self,
+        context: SolveContext,
+        source: int,
+        sink: int = None,
+        threshold: int = 1
+    ) -> tuple:
+        """
+        Пошук у ширину, що за один крок обробляє весь фронт масивами NumPy.
+
+        Дуги фронту збираються з діапазонів CSR, фільтруються маскою
+        (залишкова ємність > 0 і сусід ще не відвіданий), після чого рівні
+        та батьківські дуги нових вершин записуються одночасно.
+
+        Args:
+            context: Контекст розв'язання
+            source: Індекс початкової вершини
+            sink: Індекс вершини, після досягнення якої пошук зупиняється
+                (None — обхід усієї досяжної частини)
+            threshold: Мінімальна залишкова ємність прохідної дуги
+
+        Returns:
+            Кортеж масивів NumPy (рівні вершин, -1 для недосяжних;
+            дуга, якою досягнуто кожну вершину)
+        """
+        csr = context.csr
+        offsets = np.frombuffer(csr.offsets, dtype=np.int64)
+        heads = np.frombuffer(csr.heads, dtype=np.int64)
+        residual = np.frombuffer(context.residual, dtype=np.int64)
+        stats = context.stats
+
+        level = np.full(csr.num_nodes, -1, dtype=np.int64)
+        parent = np.full(csr.num_nodes, -1, dtype=np.int64)
+        level[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        depth = 0
+
+        while frontier.size:
+            starts = offsets[frontier]
+            counts = offsets[frontier + 1] - starts
+            total = int(counts.sum())
+            if stats is not None:
+                stats.edges_scanned += total
+            if not total:
+                break
+
+            # Індекси всіх дуг фронту: початок діапазону вершини плюс зсув у ньому
+            arcs = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+            neighbors = heads[arcs]
+            mask = (residual[arcs] >= threshold) & (level[neighbors] < 0)
+            arcs = arcs[mask]
+            neighbors = neighbors[mask]
+
+            # Кожна нова вершина отримує одну з дуг, що до неї ведуть;
+            # новий фронт — вершини, для яких збереглася саме ця дуга
+            parent[neighbors] = arcs
+            frontier = neighbors[parent[neighbors] == arcs]
+            depth += 1
+            level[frontier] = depth
+            if sink is not None and level[sink] >= 0:
+                break
+
+        return level, parent
+
+    def edmonds_karp(
+        self,
+        source: str,
+        sink: str,
+        collect_stats: bool = False,
+        progress: Callable[[SolveStats], None] = None
+    ) -> FlowResult:
+        """
+        Алгоритм Едмондса-Карпа для знаходження максимального потоку.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+            collect_stats: Повернути також статистику розв'язання (SolveStats)
+            progress: Функція, що викликається зі статистикою після кожного доповнення
+
+        Returns:
+            FlowResult, що розпаковується як (максимальний потік, словник потоків
+            по ребрах), а при collect_stats=True — (максимальний потік, словник
+            потоків, статистика)
+        """
+        return self.solve(source, sink, "edmonds_karp", collect_stats, progress)
+
+    def _augment_paths(
+        self,
+        context: SolveContext,
+        source: int = None,
+        sink: int = None,
+        limit: int = None,
+        threshold: int = 1
+    ) -> int:
+        """
+        Проштовхує потік найкоротшими доповнюючими шляхами, доки вони існують.
+
+        Args:
+            context: Контекст розв'язання
+            source: Індекс початкової вершини (за замовчуванням джерело контексту)
+            sink: Індекс цільової вершини (за замовчуванням стік контексту)
+            limit: Максимальний сумарний потік (None — без обмеження)
+            threshold: Використовувати лише шляхи із залишковою ємністю
+                кожної дуги не менше threshold
+
+        Returns:
+            Величина проштовхнутого потоку
+        """
+        csr = context.csr
+        heads, rev = csr.heads, csr.rev
+        s = context.source if source is None else source
+        t = context.sink if sink is None else sink
+        parent_arc = context.parent_arc
+        residual = context.residual
+        stats = context.stats
+        max_flow = 0
+
+        while limit is None or max_flow < limit:
+            if stats is not None:
+                started = time.perf_counter()
+            found = self._bfs(context, s, t, threshold)
+            if stats is not None:
+                bfs_done = time.perf_counter()
+                stats.phase_times["bfs"] += bfs_done - started
+            if not found:
+                break
+
+            # Знаходимо мінімальну пропускну здатність на шляху
+            path_flow = None if limit is None else limit - max_flow
+            path_length = 0
+            v = t
+            while v != s:
+                arc = parent_arc[v]
+                if path_flow is None or residual[arc] < path_flow:
+                    path_flow = residual[arc]
+                v = heads[rev[arc]]
+                path_length += 1
+
+            if stats is not None:
+                bottleneck_done = time.perf_counter()
+                stats.phase_times["bottleneck"] += bottleneck_done - bfs_done
+
+            # Оновлюємо залишкові здатності ребер і зворотних ребер
+            v = t
+            while v != s:
+                arc = parent_arc[v]
+                residual[arc] -= path_flow
+                residual[rev[arc]] += path_flow
+                v = heads[rev[arc]]
+
+            max_flow += path_flow
+            context.augmentations += 1
+
+            if stats is not None:
+                stats.phase_times["update"] += time.perf_counter() - bottleneck_done
+                stats.augmenting_paths += 1
+                stats.total_path_length += path_length
+                stats.max_flow = max_flow
+                if context.progress is not None:
+                    context.progress(stats)
+
+        return max_flow
+
+    def capacity_scaling(
+        self,
+        source: str,
+        sink: str,
+        collect_stats: bool = False,
+        progress: Callable[[SolveStats], None] = None
+    ) -> FlowResult:
+        """
+        Метод доповнюючих шляхів із масштабуванням ємностей.
+
+        На фазі з порогом Δ потік проштовхується лише шляхами, усі дуги яких
+        мають залишкову ємність не менше Δ; після кожної фази Δ зменшується
+        вдвічі. Кількість доповнень залежить від log(максимальна ємність),
+        а не від величини потоку, тому метод корисний за великого розкиду ємностей.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+            collect_stats: Повернути також статистику розв'язання (SolveStats)
+            progress: Функція, що викликається зі статистикою після кожного доповнення
+
+        Returns:
+            FlowResult, що розпаковується як (максимальний потік, словник потоків
+            по ребрах), а при collect_stats=True — (максимальний потік, словник
+            потоків, статистика)
+        """
+        return self.solve(source, sink, "capacity_scaling", collect_stats, progress)
+
+    def _capacity_scaling(self, context: SolveContext) -> int:
+        """
+        Виконує фази масштабування ємностей у контексті розв'язання.
+
+        Args:
+            context: Контекст розв'язання
+
+        Returns:
+            Величина максимального потоку
+        """
+        largest = max(context.capacities, default=0)
+        delta = 1 << (largest.bit_length() - 1) if largest > 0 else 1
+        max_flow = 0
+
+        # Остання фаза (Δ = 1) — звичайний Едмондс-Карп, тож потік максимальний,
+        # а її невдалий BFS дає мінімальний розріз
+        while delta >= 1:
+            max_flow += self._augment_paths(context, threshold=delta)
+            delta //= 2
+
+        return max_flow
+
+    def dinic(
+        self,
+        source: str,
+        sink: str,
+        collect_stats: bool = False,
+        progress: Callable[[SolveStats], None] = None
+    ) -> FlowResult:
+        """
+        Алгоритм Дініца для знаходження максимального потоку.
+
+        На кожній фазі будується шаровий граф (BFS від джерела), після чого
+        блокуючий потік знаходиться DFS-проходами з покажчиками поточного
+        ребра, тому кожне ребро переглядається не більше одного разу за фазу.
+        Загальна складність O(V²·E) замість O(V·E²) в Едмондса-Карпа.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+            collect_stats: Повернути також статистику розв'язання (SolveStats)
+            progress: Функція, що викликається зі статистикою після кожного доповнення
+
+        Returns:
+            FlowResult, що розпаковується як (максимальний потік, словник потоків
+            по ребрах), а при collect_stats=True — (максимальний потік, словник
+            потоків, статистика)
+        """
+        return self.solve(source, sink, "dinic", collect_stats, progress)
+
+    def _dinic(self, context: SolveContext) -> int:
+        """
+        Виконує фази алгоритму Дініца в контексті розв'язання.
+
+        Args:
+            context: Контекст розв'язання
+
+        Returns:
+            Величина максимального потоку
+        """
+        csr = context.csr
+        offsets, heads = csr.offsets, csr.heads
+        s, t = context.source, context.sink
+        residual = context.residual
+        stats = context.stats
+        max_flow = 0
+
+        while True:
+            if stats is not None:
+                started = time.perf_counter()
+                stats.bfs_runs += 1
+
+            # Будуємо шаровий граф
+            if context.vectorized:
+                level = self._frontier_bfs(context, s)[0].tolist()
+            else:
+                level = [-1] * csr.num_nodes
+                level[s] = 0
+                queue = deque([s])
+                while queue:
+                    node = queue.popleft()
+                    for arc in range(offsets[node], offsets[node + 1]):
+                        neighbor = heads[arc]
+                        if residual[arc] > 0 and level[neighbor] < 0:
+                            level[neighbor] = level[node] + 1
+                            queue.append(neighbor)
+                    if stats is not None:
+                        stats.edges_scanned += offsets[node + 1] - offsets[node]
+
+            if stats is not None:
+                bfs_done = time.perf_counter()
+                stats.phase_times["bfs"] += bfs_done - started
+
+            if level[t] < 0:
+                # Останній BFS невдалий: досяжні вершини утворюють мінімальний розріз
+                context.visited = bytearray(1 if value >= 0 else 0 for value in level)
+                break
+
+            # Шукаємо блокуючий потік
+            current_arc = list(offsets[:-1])
+            while True:
+                path_flow = self._dinic_augment(s, t, csr, residual, level, current_arc, stats)
+                if not path_flow:
+                    break
+                max_flow += path_flow
+                context.augmentations += 1
+                if stats is not None:
+                    stats.max_flow = max_flow
+                    if context.progress is not None:
+                        context.progress(stats)
+
+            if stats is not None:
+                stats.phase_times["blocking_flow"] += time.perf_counter() - bfs_done
+
+        return max_flow
+
+    def _dinic_augment(
+        self,
+        source: int,
+        sink: int,
+        csr: CSRGraph,
+        residual: array,
+        level: List[int],
+        current_arc: List[int],
+        stats: SolveStats = None
+    ) -> int:
+        """
+        Знаходить один доповнюючий шлях у шаровому графі та проштовхує по ньому потік.
+
+        Args:
+            source: Індекс джерела
+            sink: Індекс стоку
+            csr: CSR-представлення графа
+            residual: Залишкові ємності дуг
+            level: Рівні вершин у шаровому графі
+            current_arc: Покажчики поточної дуги для кожної вершини
+            stats: Статистика розв'язання (None — без інструментування)
+
+        Returns:
+            Величина проштовхнутого потоку (0, якщо шляху немає)
+        """
+        offsets, heads, rev = csr.offsets, csr.heads, csr.rev
+        node = source
+        path = []  # дуги поточного шляху
+
+        while True:
+            if node == sink:
+                # Знаходимо мінімальну пропускну здатність на шляху
+                path_flow = min(residual[arc] for arc in path)
+                for arc in path:
+                    residual[arc] -= path_flow
+                    residual[rev[arc]] += path_flow
+                if stats is not None:
+                    stats.augmenting_paths += 1
+                    stats.total_path_length += len(path)
+                return path_flow
+
+            end = offsets[node + 1]
+            while current_arc[node] < end:
+                arc = current_arc[node]
+                neighbor = heads[arc]
+                if residual[arc] > 0 and level[neighbor] == level[node] + 1:
+                    path.append(arc)
+                    node = neighbor
+                    break
+                current_arc[node] += 1
+            else:
+                # Глухий кут: прибираємо вершину з шарового графа
+                level[node] = -1
+                if not path:
+                    return 0
+                arc = path.pop()
+                node = heads[rev[arc]]
+                current_arc[node] += 1
+
+    def push_relabel(
+        self,
+        source: str,
+        sink: str,
+        strategy: str = "fifo",
+        collect_stats: bool = False,
+        progress: Callable[[SolveStats], None] = None
+    ) -> FlowResult:
+        """
+        Алгоритм проштовхування передпотоку (push-relabel).
+
+        Активні вершини обробляються в порядку FIFO або за найбільшою висотою.
+        Періодичне глобальне переозначення (зворотний BFS від стоку) та
+        евристика розриву (gap) відсікають вершини, з яких стік недосяжний.
+        На щільних графах працює швидше за методи доповнюючих шляхів.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+            strategy: Вибір активної вершини ("fifo" або "highest")
+            collect_stats: Повернути також статистику розв'язання (SolveStats)
+            progress: Функція, що викликається зі статистикою після кожного
+                глобального переозначення
+
+        Returns:
+            FlowResult, що розпаковується як (максимальний потік, словник потоків
+            по ребрах), а при collect_stats=True — (максимальний потік, словник
+            потоків, статистика)
+
+        Raises:
+            ValueError: Якщо стратегія невідома
+        """
+        if strategy not in ("fifo", "highest"):
+            raise ValueError(f"Невідома стратегія: {strategy}")
+
+        context = self._context(source, sink)
+        if context is None:
+            return FlowResult(self, stats=SolveStats("push_relabel") if collect_stats else None)
+
+        algorithm = f"push_relabel/{strategy}"
+        cached = self._cached_result(source, sink, algorithm, collect_stats, progress)
+        if cached is not None:
+            return cached
+
+        self._instrument(context, "push_relabel", collect_stats, progress)
+        max_flow = self._run_solver(context, "push_relabel", strategy)
+
+        return self._solve_result(context, max_flow, collect_stats, (source, sink, algorithm))
+
+    def _push_relabel(self, context: SolveContext, strategy: str = "fifo") -> int:
+        """
+        Виконує проштовхування передпотоку в контексті розв'язання.
+
+        Args:
+            context: Контекст розв'язання
+            strategy: Вибір активної вершини ("fifo" або "highest")
+
+        Returns:
+            Величина максимального потоку
+        """
+        csr = context.csr
+        offsets, heads, rev = csr.offsets, csr.heads, csr.rev
+        s, t = context.source, context.sink
+        n = csr.num_nodes
+        residual = context.residual
+        height = [0] * n
+        excess = [0] * n
+        current_arc = list(offsets[:-1])
+        # Кількість вершин на кожній висоті (для евристики розриву)
+        height_count = [0] * (2 * n + 1)
+
+        # Початковий передпотік: насичуємо всі дуги з джерела
+        for arc in range(offsets[s], offsets[s + 1]):
+            capacity = residual[arc]
+            if capacity > 0:
+                residual[arc] = 0
+                residual[rev[arc]] += capacity
+                excess[heads[arc]] += capacity
+                excess[s] -= capacity
+
+        stats = context.stats
+
+        def global_relabel():
+            """Точно перераховує висоти зворотним BFS від стоку та від джерела."""
+            if stats is not None:
+                started = time.perf_counter()
+                stats.bfs_runs += 1
+            for node in range(n):
+                height[node] = 2 * n
+            for root, base in ((t, 0), (s, n)):
+                height[root] = base
+                queue = deque([root])
+                while queue:
+                    node = queue.popleft()
+                    for arc in range(offsets[node], offsets[node + 1]):
+                        neighbor = heads[arc]
+                        if height[neighbor] == 2 * n and residual[rev[arc]] > 0:
+                            height[neighbor] = height[node] + 1
+                            queue.append(neighbor)
+                    if stats is not None:
+                        stats.edges_scanned += offsets[node + 1] - offsets[node]
+            for i in range(len(height_count)):
+                height_count[i] = 0
+            for node in range(n):
+                height_count[height[node]] += 1
+                current_arc[node] = offsets[node]
+            if stats is not None:
+                stats.phase_times["global_relabel"] += time.perf_counter() - started
+                stats.max_flow = excess[t]
+                if context.progress is not None:
+                    context.progress(stats)
+
+        global_relabel()
+        relabels_since_global = 0
+
+        active = {node for node in range(n) if excess[node] > 0 and node != s and node != t}
+        fifo_queue = deque(active)
+        buckets = [[] for _ in range(2 * n + 1)]
+        highest = 0
+
+        def rebuild_buckets():
+            """Розкладає активні вершини по відрами висот після зміни висот."""
+            nonlocal highest
+            for bucket in buckets:
+                bucket.clear()
+            for node in active:
+                buckets[height[node]].append(node)
+            highest = max((height[node] for node in active), default=0)
+
+        if strategy == "highest":
+            rebuild_buckets()
+
+        def next_active():
+            """Повертає наступну активну вершину або None."""
+            nonlocal highest
+            if strategy == "fifo":
+                while fifo_queue:
+                    node = fifo_queue.popleft()
+                    if node in active:
+                        return node
+                return None
+            while highest >= 0:
+                bucket = buckets[highest]
+                while bucket:
+                    node = bucket.pop()
+                    if node in active and height[node] == highest:
+                        return node
+                highest -= 1
+            return None
+
+        def activate(node):
+            """Позначає вершину як активну."""
+            nonlocal highest
+            if node in active or node == s or node == t:
+                return
+            active.add(node)
+            if strategy == "fifo":
+                fifo_queue.append(node)
+            else:
+                buckets[height[node]].append(node)
+                highest = max(highest, height[node])
+
+        node = next_active()
+        while node is not None:
+            active.discard(node)
+            end = offsets[node + 1]
+            heights_changed = False
+
+            # Розвантажуємо вершину повністю
+            while excess[node] > 0:
+                if current_arc[node] < end:
+                    arc = current_arc[node]
+                    neighbor = heads[arc]
+                    capacity = residual[arc]
+                    if capacity > 0 and height[node] == height[neighbor] + 1:
+                        delta = min(excess[node], capacity)
+                        residual[arc] -= delta
+                        residual[rev[arc]] += delta
+                        excess[node] -= delta
+                        excess[neighbor] += delta
+                        context.augmentations += 1
+                        if stats is not None:
+                            stats.pushes += 1
+                        activate(neighbor)
+                    else:
+                        current_arc[node] += 1
+                    continue
+
+                # Переозначення
+                old_height = height[node]
+                new_height = 2 * n
+                for arc in range(offsets[node], end):
+                    if residual[arc] > 0:
+                        new_height = min(new_height, height[heads[arc]] + 1)
+                height_count[old_height] -= 1
+                height[node] = new_height
+                height_count[new_height] += 1
+                current_arc[node] = offsets[node]
+                relabels_since_global += 1
+                if stats is not None:
+                    stats.relabels += 1
+
+                # Евристика розриву: вище порожнього рівня стік недосяжний
+                if height_count[old_height] == 0 and old_height < n:
+                    for other in range(n):
+                        h = height[other]
+                        if old_height < h < n:
+                            height_count[h] -= 1
+                            height[other] = n + 1
+                            height_count[n + 1] += 1
+                            current_arc[other] = offsets[other]
+                    heights_changed = True
+
+                if relabels_since_global >= n:
+                    global_relabel()
+                    relabels_since_global = 0
+                    heights_changed = True
+
+                if height[node] >= 2 * n:
+                    break
+
+            if heights_changed and strategy == "highest":
+                rebuild_buckets()
+            node = next_active()
+
+        context.visited = None
+        if stats is not None:
+            stats.max_flow = excess[t]
+        return excess[t]
+
+    def _collect_flows(self, context: SolveContext) -> Dict[str, Dict[str, int]]:
+        """
+        Відновлює фактичні потоки по ребрах із залишкових ємностей.
+
+        Потік по ребру дорівнює різниці між початковою та залишковою
+        ємністю його прямої дуги. Назви вершин з'являються лише тут.
+
+        Args:
+            context: Контекст завершеного розв'язання
+
+        Returns:
+            Словник потоків по ребрах
+        """
+        csr = context.csr
+        capacities, residual = context.capacities, context.residual
+        names = self._names
+        flow_graph = defaultdict(dict)
+        for k in range(len(csr.edge_arc)):
+            arc = csr.edge_arc[k]
+            flow = capacities[arc] - residual[arc]
+            if flow > 0:
+                neighbors = flow_graph[names[self._tails[k]]]
+                to_node = names[self._heads[k]]
+                neighbors[to_node] = neighbors.get(to_node, 0) + flow
+        return dict(flow_graph)
+
+    def min_cost_max_flow(self, source: str, sink: str) -> Tuple[int, int, Dict[str, Dict[str, int]]]:
+        """
+        Максимальний потік мінімальної вартості.
+
+        Метод послідовних найкоротших шляхів: кожен доповнюючий шлях —
+        найдешевший у залишковій мережі. Потенціали Джонсона роблять
+        зведені вартості невід'ємними, тому шлях шукається алгоритмом
+        Дейкстри з бінарною купою. Початкові потенціали — нулі або, за
+        наявності від'ємних вартостей, результат алгоритму Беллмана-Форда.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+
+        Returns:
+            Кортеж (максимальний потік, загальна вартість, словник потоків по ребрах)
+
+        Raises:
+            ValueError: Якщо залишкова мережа містить цикл від'ємної вартості
+        """
+        context = self._context(source, sink)
+        if context is None:
+            return 0, 0, {}
+
+        csr = context.csr
+        offsets, heads, rev, costs = csr.offsets, csr.heads, csr.rev, csr.costs
+        residual = context.residual
+        s, t = context.source, context.sink
+        n = csr.num_nodes
+        potential = [0] * n
+
+        if any(cost < 0 for k, cost in enumerate(costs) if residual[k] > 0):
+            # Беллман-Форд (SPFA) для початкових потенціалів
+            potential = [None] * n
+            potential[s] = 0
+            queue = deque([s])
+            in_queue = bytearray(n)
+            in_queue[s] = 1
+            relaxations = 0
+            while queue:
+                node = queue.popleft()
+                in_queue[node] = 0
+                for arc in range(offsets[node], offsets[node + 1]):
+                    if residual[arc] > 0:
+                        neighbor = heads[arc]
+                        candidate = potential[node] + costs[arc]
+                        if potential[neighbor] is None or candidate < potential[neighbor]:
+                            potential[neighbor] = candidate
+                            relaxations += 1
+                            if relaxations > n * len(costs):
+                                raise ValueError("Мережа містить цикл від'ємної вартості")
+                            if not in_queue[neighbor]:
+                                in_queue[neighbor] = 1
+                                queue.append(neighbor)
+            potential = [0 if value is None else value for value in potential]
+
+        max_flow = 0
+        total_cost = 0
+        parent_arc = context.parent_arc
+
+        while True:
+            # Дейкстра за зведеними вартостями
+            dist = [None] * n
+            dist[s] = 0
+            heap = [(0, s)]
+            while heap:
+                d, node = heapq.heappop(heap)
+                if d > dist[node]:
+                    continue
+                for arc in range(offsets[node], offsets[node + 1]):
+                    if residual[arc] > 0:
+                        neighbor = heads[arc]
+                        candidate = d + costs[arc] + potential[node] - potential[neighbor]
+                        if dist[neighbor] is None or candidate < dist[neighbor]:
+                            dist[neighbor] = candidate
+                            parent_arc[neighbor] = arc
+                            heapq.heappush(heap, (candidate, neighbor))
+
+            if dist[t] is None:
+                break
+
+            for node in range(n):
+                if dist[node] is not None:
+                    potential[node] += dist[node]
+
+            # Знаходимо мінімальну пропускну здатність на шляху
+            path_flow = None
+            v = t
+            while v != s:
+                arc = parent_arc[v]
+                if path_flow is None or residual[arc] < path_flow:
+                    path_flow = residual[arc]
+                v = heads[rev[arc]]
+
+            v = t
+            while v != s:
+                arc = parent_arc[v]
+                residual[arc] -= path_flow
+                residual[rev[arc]] += path_flow
+                total_cost += path_flow * costs[arc]
+                v = heads[rev[arc]]
+
+            max_flow += path_flow
+            context.augmentations += 1
+
+        return max_flow, total_cost, self._collect_flows(context)
+
+    def boundary_nodes(self) -> Tuple[List[str], List[str]]:
+        """
+        Знаходить вершини без вхідних ребер (джерела) та без вихідних (стоки).
+
+        Враховуються лише ребра з додатною пропускною здатністю.
+
+        Returns:
+            Кортеж (список джерел, список стоків) у порядку додавання вершин
+        """
+        has_inflow = bytearray(len(self._names))
+        has_outflow = bytearray(len(self._names))
+        for k in range(len(self._tails)):
+            if self._caps[k] != 0:
+                has_outflow[self._tails[k]] = 1
+                has_inflow[self._heads[k]] = 1
+        sources = [name for i, name in enumerate(self._names) if has_outflow[i] and not has_inflow[i]]
+        sinks = [name for i, name in enumerate(self._names) if has_inflow[i] and not has_outflow[i]]
+        return sources, sinks
+
+    def multi_source_max_flow(
+        self,
+        sources,
+        sinks,
+        supplies: Dict[str, int] = None,
+        demands: Dict[str, int] = None,
+        with_min_cut: bool = False
+    ) -> FlowResult:
+        """
+        Максимальний потік між множинами джерел і стоків.
+
+        Супер-вершини не додаються: BFS стартує одразу з усіх джерел, що
+        мають запас, і завершується в першому стоку з незадоволеним попитом.
+        Обмеження пропозиції та попиту враховуються у величині шляху, тому
+        вся арифметика залишається цілочисловою.
+
+        Args:
+            sources: Колекція джерел
+            sinks: Колекція стоків
+            supplies: Максимальна пропозиція джерел (за замовчуванням без обмежень)
+            demands: Максимальний попит стоків (за замовчуванням без обмежень)
+            with_min_cut: Повернути також мінімальний розріз
+
+        Returns:
+            FlowResult, що розпаковується як (максимальний потік, словник потоків
+            по ребрах); якщо with_min_cut, додатково вершини з боку джерел і ребра розрізу
+
+        Raises:
+            ValueError: Якщо множини джерел і стоків перетинаються
+        """
+        supplies = supplies or {}
+        demands = demands or {}
+        source_ids = [self._index[name] for name in sources if name in self._index]
+        sink_ids = [self._index[name] for name in sinks if name in self._index]
+        if set(source_ids) & set(sink_ids):
+            raise ValueError("Множини джерел і стоків не повинні перетинатися")
+
+        csr = self._csr_graph()
+        context = SolveContext(csr, -1, -1)
+        offsets, heads, rev = csr.offsets, csr.heads, csr.rev
+        residual, parent_arc = context.residual, context.parent_arc
+        # Залишок пропозиції та попиту; None — без обмежень
+        supply = {node: supplies.get(self._names[node]) for node in source_ids}
+        demand = {node: demands.get(self._names[node]) for node in sink_ids}
+        max_flow = 0
+
+        while True:
+            visited = bytearray(csr.num_nodes)
+            context.visited = visited
+            queue = deque()
+            for node in source_ids:
+                if supply[node] != 0:
+                    visited[node] = 1
+                    parent_arc[node] = -1
+                    queue.append(node)
+
+            # Пошук у ширину від усіх джерел одночасно
+            target = -1
+            while queue and target < 0:
+                node = queue.popleft()
+                for arc in range(offsets[node], offsets[node + 1]):
+                    neighbor = heads[arc]
+                    if not visited[neighbor] and residual[arc] > 0:
+                        visited[neighbor] = 1
+                        parent_arc[neighbor] = arc
+                        if neighbor in demand and demand[neighbor] != 0:
+                            target = neighbor
+                            break
+                        queue.append(neighbor)
+
+            if target < 0:
+                break
+
+            # Знаходимо мінімальну пропускну здатність на шляху
+            path_flow = demand[target]
+            v = target
+            while parent_arc[v] >= 0:
+                arc = parent_arc[v]
+                if path_flow is None or residual[arc] < path_flow:
+                    path_flow = residual[arc]
+                v = heads[rev[arc]]
+            origin = v
+            if supply[origin] is not None and supply[origin] < path_flow:
+                path_flow = supply[origin]
+
+            v = target
+            while v != origin:
+                arc = parent_arc[v]
+                residual[arc] -= path_flow
+                residual[rev[arc]] += path_flow
+                v = heads[rev[arc]]
+
+            if supply[origin] is not None:
+                supply[origin] -= path_flow
+            if demand[target] is not None:
+                demand[target] -= path_flow
+            max_flow += path_flow
+            context.augmentations += 1
+
+        if with_min_cut:
+            return FlowResult(self, context, max_flow, min_cut=self._min_cut(context))
+        return FlowResult(self, context, max_flow)
+
+    def edge_sensitivity(
+        self,
+        source: str,
+        sink: str,
+        increase: int = None,
+        algorithm: str = "auto"
+    ) -> List[Tuple[str, str, bool, int]]:
+        """
+        Оцінює для кожного ребра, чи збільшить потік розширення його ємності і на скільки.
+
+        Мережа розв'язується один раз. Ребро (u, v) критичне «вгору», якщо
+        в залишковій мережі u досяжна з джерела, а зі v досяжний стік:
+        тоді додаткова ємність одразу дає доповнюючий шлях. Лише для таких
+        ребер приріст рахується обмеженими доповненнями на копії залишкової
+        мережі; для решти він дорівнює нулю без жодних обчислень.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+            increase: На скільки одиниць збільшується ємність ребра
+                (None — без обмеження)
+            algorithm: Назва алгоритму базового розв'язання (як у solve)
+
+        Returns:
+            Список (від, до, критичне, приріст потоку), відсортований за
+            спаданням приросту; нескінченний приріст — float('inf')
+
+        Raises:
+            ValueError: Якщо алгоритм невідомий
+        """
+        algorithm = self._resolve_algorithm(algorithm)
+        context = self._context(source, sink)
+        if context is None:
+            return []
+        max_flow = self._run_solver(context, algorithm)
+
+        if context.visited is None:
+            self._bfs(context)
+        source_side = context.visited
+        sink_side = self._sink_side(context)
+
+        csr = context.csr
+        names = self._names
+        bound = csr.infinite if increase is None else increase
+        # Нескінченні дуги обмежені сумою скінченних ємностей; після
+        # розширення ребра ця межа має зрости на ту саму величину
+        infinite_arcs = [arc for arc in csr.edge_arc if context.capacities[arc] == csr.infinite]
+        result = []
+        for k in range(len(csr.edge_arc)):
+            tail, head = self._tails[k], self._heads[k]
+            # Нескінченну ємність розширити неможливо
+            critical = bool(source_side[tail] and sink_side[head]) and self._caps[k] != INFINITE_CAPACITY
+            gain = 0
+            if critical and bound > 0:
+                probe = SolveContext(csr, context.source, context.sink)
+                probe.residual = context.residual[:]
+                probe.residual[csr.edge_arc[k]] += bound
+                for arc in infinite_arcs:
+                    probe.residual[arc] += bound
+                gain = self._augment_paths(probe, limit=increase)
+                # Скінченні ємності не дають потоку, більшого за їхню суму
+                if increase is None and max_flow + gain >= csr.infinite:
+                    gain = float('inf')
+            result.append((names[tail], names[head], critical, gain))
+
+        result.sort(key=lambda item: -item[3])
+        return result
+
+    def _sink_side(self, context: SolveContext) -> bytearray:
+        """
+        Знаходить вершини, з яких стік досяжний у залишковій мережі.
+
+        Args:
+            context: Контекст розв'язання
+
+        Returns:
+            Маска вершин (1 — стік досяжний)
+        """
+        csr = context.csr
+        offsets, heads, rev = csr.offsets, csr.heads, csr.rev
+        residual = context.residual
+        reaches = bytearray(csr.num_nodes)
+        reaches[context.sink] = 1
+        queue = deque([context.sink])
+
+        # Зворотний BFS: сусід досягає вершини, якщо його дуга до неї має залишок
+        while queue:
+            node = queue.popleft()
+            for arc in range(offsets[node], offsets[node + 1]):
+                neighbor = heads[arc]
+                if not reaches[neighbor] and residual[rev[arc]] > 0:
+                    reaches[neighbor] = 1
+                    queue.append(neighbor)
+        return reaches
+
+    def _min_cut(self, context: SolveContext) -> Tuple[set, List[Tuple[str, str]]]:
+        """
+        Виділяє мінімальний розріз із залишкової мережі завершеного розв'язання.
+
+        Використовує вершини, досяжні з джерела в останньому (невдалому)
+        BFS розв'язувача; лише якщо розв'язувач такого BFS не виконував,
+        робиться один додатковий прохід. Складність O(V + E).
+
+        Args:
+            context: Контекст завершеного розв'язання
+
+        Returns:
+            Кортеж (множина вершин з боку джерела, список ребер розрізу)
+        """
+        if context.visited is None:
+            self._bfs(context)
+        visited = context.visited
+        csr = context.csr
+        names = self._names
+
+        source_side = {names[node] for node in range(csr.num_nodes) if visited[node]}
+        cut_edges = []
+        for k in range(len(csr.edge_arc)):
+            tail, head = self._tails[k], self._heads[k]
+            if visited[tail] and not visited[head] and context.capacities[csr.edge_arc[k]] > 0:
+                cut_edges.append((names[tail], names[head]))
+        return source_side, cut_edges
+
+    def solve_with_min_cut(
+        self,
+        source: str,
+        sink: str,
+        algorithm: str = "edmonds_karp"
+    ) -> FlowResult:
+        """
+        Обчислює максимальний потік і мінімальний розріз за одне розв'язання.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+            algorithm: Назва алгоритму (як у solve)
+
+        Returns:
+            FlowResult, що розпаковується як (максимальний потік, словник потоків
+            по ребрах, вершини з боку джерела, ребра мінімального розрізу)
+        """
+        algorithm = self._resolve_algorithm(algorithm)
+        context = self._context(source, sink)
+        if context is None:
+            return FlowResult(self, min_cut=({source}, []))
+
+        max_flow = self._run_solver(context, algorithm)
+
+        return FlowResult(self, context, max_flow, min_cut=self._min_cut(context))
+
+    def min_cut(self, source: str, sink: str) -> Tuple[set, List[Tuple[str, str]]]:
+        """
+        Знаходить мінімальний розріз між джерелом і стоком.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+
+        Returns:
+            Кортеж (множина вершин з боку джерела, список ребер розрізу)
+        """
+        result = self.solve_with_min_cut(source, sink)
+        return result.source_side, result.cut_edges
+
+    def solve(
+        self,
+        source: str,
+        sink: str,
+        algorithm: str = "edmonds_karp",
+        collect_stats: bool = False,
+        progress: Callable[[SolveStats], None] = None
+    ) -> FlowResult:
+        """
+        Обчислює максимальний потік обраним алгоритмом.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+            algorithm: Назва алгоритму ("edmonds_karp", "capacity_scaling", "dinic",
+                "push_relabel" або "auto" — вибір за щільністю графа)
+            collect_stats: Повернути також статистику розв'язання (SolveStats)
+            progress: Функція, що викликається зі статистикою в міру
+                просування алгоритму
+
+        Returns:
+            FlowResult, що розпаковується як (максимальний потік, словник потоків
+            по ребрах), а при collect_stats=True — (максимальний потік, словник
+            потоків, статистика)
+
+        Raises:
+            ValueError: Якщо алгоритм невідомий
+        """
+        algorithm = self._resolve_algorithm(algorithm)
+        context = self._context(source, sink)
+        if context is None:
+            return FlowResult(self, stats=SolveStats(algorithm) if collect_stats else None)
+
+        cached = self._cached_result(source, sink, algorithm, collect_stats, progress)
+        if cached is not None:
+            return cached
+
+        self._instrument(context, algorithm, collect_stats, progress)
+        max_flow = self._run_solver(context, algorithm)
+
+        return self._solve_result(context, max_flow, collect_stats, (source, sink, algorithm))
+
+    def _instrument(
+        self,
+        context: SolveContext,
+        algorithm: str,
+        collect_stats: bool,
+        progress: Callable[[SolveStats], None]
+    ):
+        """
+        Вмикає збирання статистики в контексті, якщо її запитано.
+
+        Args:
+            context: Контекст розв'язання
+            algorithm: Назва алгоритму
+            collect_stats: Чи потрібна статистика у результаті
+            progress: Функція зворотного виклику прогресу або None
+        """
+        if collect_stats or progress is not None:
+            context.stats = SolveStats(algorithm)
+            context.progress = progress
+
+    def _solve_result(
+        self,
+        context: SolveContext,
+        max_flow: int,
+        collect_stats: bool,
+        request: Tuple[str, str, str] = None
+    ) -> FlowResult:
+        """
+        Формує результат розв'язання та, якщо можна, зберігає його в кеші.
+
+        Args:
+            context: Контекст розв'язання
+            max_flow: Величина максимального потоку
+            collect_stats: Чи додавати статистику до результату
+            request: Запит (джерело, стік, алгоритм) для ключа кешу
+
+        Returns:
+            FlowResult, що розпаковується як (максимальний потік, словник
+            потоків) або (максимальний потік, словник потоків, статистика)
+        """
+        result = FlowResult(self, context, max_flow, context.stats if collect_stats else None)
+        if self.result_cache is not None and request is not None and context.stats is None:
+            self.result_cache.put((self.content_hash(),) + request, result)
+        return result
+
+    def _cached_result(
+        self,
+        source: str,
+        sink: str,
+        algorithm: str,
+        collect_stats: bool,
+        progress: Callable[[SolveStats], None]
+    ) -> FlowResult:
+        """
+        Шукає готовий результат у кеші мережі.
+
+        Розв'язання зі статистикою чи зворотним викликом прогресу завжди
+        виконуються заново, бо їх сенс — у вимірюванні самого розв'язання.
+
+        Args:
+            source: Вершина-джерело
+            sink: Вершина-стік
+            algorithm: Назва конкретного алгоритму
+            collect_stats: Чи запитано статистику
+            progress: Функція зворотного виклику прогресу або None
+
+        Returns:
+            Збережений FlowResult або None
+        """
+        if self.result_cache is None or collect_stats or progress is not None:
+            return None
+        return self.result_cache.get((self.content_hash(), source, sink, algorithm))
+
+    def _resolve_algorithm(self, algorithm: str) -> str:
+        """
+        Перевіряє назву алгоритму та розкриває "auto".
+
+        Args:
+            algorithm: Назва алгоритму
+
+        Returns:
+            Назва конкретного алгоритму
+
+        Raises:
+            ValueError: Якщо алгоритм невідомий
+        """
+        if algorithm == "auto":
+            algorithm = "push_relabel" if self.density() >= PUSH_RELABEL_DENSITY_THRESHOLD else "dinic"
+        if algorithm not in ("edmonds_karp", "capacity_scaling", "dinic", "push_relabel"):
+            raise ValueError(f"Невідомий алгоритм: {algorithm}")
+        return algorithm
+
+    def _run_solver(self, context: SolveContext, algorithm: str, strategy: str = "fifo") -> int:
+        """
+        Запускає обраний алгоритм у контексті розв'язання.
+
+        Args:
+            context: Контекст розв'язання
+            algorithm: Назва конкретного алгоритму
+            strategy: Стратегія вибору активної вершини для push-relabel
+
+        Returns:
+            Величина максимального потоку
+        """
+        stats = context.stats
+        if stats is not None:
+            started = time.perf_counter()
+
+        if algorithm == "dinic":
+            max_flow = self._dinic(context)
+        elif algorithm == "push_relabel":
+            max_flow = self._push_relabel(context, strategy)
+        elif algorithm == "capacity_scaling":
+            max_flow = self._capacity_scaling(context)
+        else:
+            max_flow = self._augment_paths(context)
+
+        if stats is not None:
+            stats.total_time += time.perf_counter() - started
+            stats.max_flow = max_flow
+        return max_flow
+
+    def gomory_hu_tree(self, algorithm: str = "auto", max_workers: int = 1) -> "GomoryHuTree":
+        """
+        Будує дерево Гоморі-Ху (алгоритм Гасфілда) для запитів потоку між усіма парами.
+
+        Дерево розрізів існує лише для неорієнтованих мереж, тому ребра
+        симетризуються: ємність між u та v дорівнює c(u, v) + c(v, u).
+        Потрібно рівно n - 1 обчислень максимального потоку; кожен
+        подальший запит до дерева виконується за O(довжина шляху).
+
+        Args:
+            algorithm: Назва алгоритму (як у solve)
+            max_workers: Кількість процесів (1 — послідовна побудова). Потоки
+                обчислюються спекулятивними пакетами за поточними батьками;
+                розріз, пару якого змінив попередній крок пакета, перераховується.
+
+        Returns:
+            Дерево Гоморі-Ху
+
+        Raises:
+            ValueError: Якщо алгоритм невідомий
+        """
+        algorithm = self._resolve_algorithm(algorithm)
+        csr = self._symmetric_csr()
+        n = csr.num_nodes
+        parent = [0] * n
+        weight = [0] * n
+
+        base = (self, csr, algorithm)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        _set_gomory_hu_base(base)
+        try:
+            if max_workers <= 1 or n <= 2:
+                for s in range(1, n):
+                    _gusfield_step(s, parent, weight, _gomory_hu_cut((s, parent[s])))
+            else:
+                with _gomory_hu_executor(base, max_workers) as executor:
+                    batch_size = 2 * max_workers
+                    for start in range(1, n, batch_size):
+                        # Спекулятивно рахуємо пакет пар за поточними батьками
+                        pairs = [(s, parent[s]) for s in range(start, min(n, start + batch_size))]
+                        for (s, t), cut in zip(pairs, executor.map(_gomory_hu_cut, pairs)):
+                            if parent[s] != t:
+                                # Попередній розріз пакета змінив пару: перераховуємо
+                                cut = _gomory_hu_cut((s, parent[s]))
+                            _gusfield_step(s, parent, weight, cut)
+        finally:
+            _set_gomory_hu_base(None)
+
+        return GomoryHuTree(list(self._names), parent, weight, csr.infinite)
+
+    def _symmetric_csr(self) -> CSRGraph:
+        """
+        Будує CSR неорієнтованої версії мережі.
+
+        Зворотна дуга кожного ребра отримує ту саму ємність, що й пряма,
+        тож ребро можна проходити в обидва боки.
+
+        Returns:
+            CSR-представлення симетризованого графа
+        """
+        csr = CSRGraph(len(self._names), self._tails, self._heads, self._caps)
+        caps, rev = csr.caps, csr.rev
+        for arc in csr.edge_arc:
+            caps[rev[arc]] = caps[arc]
+        return csr
+
+    def density(self) -> float:
+        """
+        Обчислює щільність графа: частку наявних ребер серед усіх можливих.
+
+        Returns:
+            Щільність від 0 до 1
+        """
+        n = len(self._names)
+        if n < 2:
+            return 0.0
+        edges = sum(1 for capacity in self._caps if capacity != 0)
+        return edges / (n * (n - 1))
+
+
+class IncrementalMaxFlow:
+    """
+    Максимальний потік із «теплим стартом» після зміни ємностей.
+
+    Зберігає залишкову мережу останнього розв'язання. Після зміни ємності
+    потік відновлюється лише тими доповненнями чи скасуваннями, яких
+    вимагає зміна: збільшення дає нові доповнюючі шляхи, а зменшення нижче
+    поточного потоку спершу перенаправляє надлишок в обхід ребра і лише
+    решту скасовує вздовж шляхів до джерела та від стоку.
+    Зміни також записуються в саму мережу.
+    """
+
+    def __init__(self, network: MaxFlowNetwork, source: str, sink: str):
+        """
+        Розв'язує задачу та запам'ятовує залишкову мережу.
+
+        Args:
+            network: Мережа потоків
+            source: Вершина-джерело
+            sink: Вершина-стік
+
+        Raises:
+            ValueError: Якщо джерело чи стік відсутні або збігаються
+        """
+        context = network._context(source, sink)
+        if context is None:
+            raise ValueError("Джерело та стік повинні бути різними вершинами мережі")
+        self.network = network
+        self.source = source
+        self.sink = sink
+        self._context = self._own_context(context)
+        self.max_flow = network._augment_paths(self._context)
+
+    def _own_context(self, context: SolveContext) -> SolveContext:
+        """
+        Робить контекст власним для розв'язувача.
+
+        Ємності копіюються, а CSR копіюється поверхнево (масиви спільні),
+        тож зміни ємностей і межі нескінченності не зачіпають CSR мережі.
+        Запам'ятовуються прямі дуги нескінченних ребер.
+
+        Args:
+            context: Контекст розв'язання на CSR мережі
+
+        Returns:
+            Той самий контекст із власними ємностями та CSR
         """
-        Додає ребро до графа.
-        
+        context.capacities = context.capacities[:]
+        context.csr = copy.copy(context.csr)
+        caps = self.network._caps
+        self._infinite_arcs = [
+            arc for k, arc in enumerate(context.csr.edge_arc) if caps[k] == INFINITE_CAPACITY
+        ]
+        return context
+
+    def flow_graph(self) -> Dict[str, Dict[str, int]]:
+        """
+        Повертає поточні потоки по ребрах.
+
+        Returns:
+            Словник потоків по ребрах
+        """
+        return self.network._collect_flows(self._context)
+
+    def set_capacity(self, from_node: str, to_node: str, capacity: int) -> int:
+        """
+        Змінює ємність ребра та відновлює максимальний потік.
+
+        Нове ребро вбудовується в CSR з перенесенням поточних потоків;
+        для наявного ребра зміна виконується на місці.
+
+        Args:
+            from_node: Вихідна вершина
+            to_node: Цільова вершина
+            capacity: Нова пропускна здатність (ціле невід'ємне число)
+
+        Returns:
+            Новий максимальний потік
+
+        Raises:
+            ValueError: Якщо пропускна здатність від'ємна або не ціла
+        """
+        if capacity == float('inf') or capacity < 0 or capacity != int(capacity):
+            raise ValueError("Пропускна здатність повинна бути цілим невід'ємним числом")
+        capacity = int(capacity)
+
+        network = self.network
+        u = network._index.get(from_node)
+        v = network._index.get(to_node)
+        edge_id = None if u is None or v is None else network._edge_id(u, v)
+        previous = None if edge_id is None else network._caps[edge_id]
+        network.add_edge(from_node, to_node, capacity)
+        if edge_id is None or edge_id >= len(self._context.csr.edge_arc):
+            self._rebuild()
+            self.max_flow += network._augment_paths(self._context)
+            return self.max_flow
+
+        context = self._context
+        csr = context.csr
+        arc = csr.edge_arc[edge_id]
+        if previous == INFINITE_CAPACITY:
+            # Ребро стає скінченним і вперше входить до суми скінченних ємностей
+            self._infinite_arcs.remove(arc)
+            previous = 0
+        if capacity > previous:
+            # Сума скінченних ємностей зросла: нескінченні дуги мають
+            # залишатися більшими за будь-який скінченний потік
+            growth = capacity - previous
+            csr.infinite += growth
+            for infinite_arc in self._infinite_arcs:
+                context.capacities[infinite_arc] += growth
+                context.residual[infinite_arc] += growth
+        flow = context.capacities[arc] - context.residual[arc]
+        context.capacities[arc] = capacity
+
+        if capacity >= flow:
+            context.residual[arc] = capacity - flow
+            self.max_flow += network._augment_paths(context)
+            return self.max_flow
+
+        # Потік перевищує нову ємність: знімаємо надлишок з ребра
+        surplus = flow - capacity
+        context.residual[arc] = 0
+        context.residual[csr.rev[arc]] -= surplus
+        tail, head = network._index[from_node], network._index[to_node]
+
+        # Спершу перенаправляємо надлишок в обхід ребра
+        surplus -= network._augment_paths(context, tail, head, surplus)
+        if surplus:
+            # Решту повертаємо до джерела та забираємо зі стоку
+            if tail != context.source:
+                network._augment_paths(context, tail, context.source, surplus)
+            if head != context.sink:
+                network._augment_paths(context, context.sink, head, surplus)
+            self.max_flow -= surplus
+            self.max_flow += network._augment_paths(context)
+        return self.max_flow
+
+    def add_edge(self, from_node: str, to_node: str, capacity: int) -> int:
+        """
+        Додає ребро (або змінює ємність наявного) та відновлює потік.
+
         Args:
             from_node: Вихідна вершина
             to_node: Цільова вершина
             capacity: Пропускна здатність ребра
+
+        Returns:
+            Новий максимальний потік
         """
-        self.graph[from_node][to_node] = capacity
-        self.nodes.add(from_node)
-        self.nodes.add(to_node)
-        # Додаємо зворотне ребро з нульовою пропускною здатністю
-        if to_node not in self.graph:
-            self.graph[to_node] = {}
-        if from_node not in self.graph[to_node]:
-            self.graph[to_node][from_node] = 0
-    
-    def bfs(self, source: str, sink: str, parent: Dict[str, str]) -> bool:
+        return self.set_capacity(from_node, to_node, capacity)
+
+    def remove_edge(self, from_node: str, to_node: str) -> int:
         """
-        Пошук в ширину для знаходження шляху від джерела до стоку.
-        
+        Вилучає ребро, обнуляючи його ємність, та відновлює потік.
+
         Args:
-            source: Вершина-джерело
-            sink: Вершина-стік
-            parent: Словник для збереження батьківських вершин
-            
+            from_node: Вихідна вершина
+            to_node: Цільова вершина
+
         Returns:
-            True, якщо існує шлях від джерела до стоку, інакше False
+            Новий максимальний потік
+
+        Raises:
+            KeyError: Якщо ребра немає в мережі
         """
-        visited = {source}
-        queue = deque([source])
-        
-        while queue:
-            node = queue.popleft()
-            
-            for neighbor, capacity in self.graph[node].items():
-                if neighbor not in visited and capacity > 0:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-                    parent[neighbor] = node
-                    if neighbor == sink:
-                        return True
-        
-        return False
-    
-    def edmonds_karp(self, source: str, sink: str) -> Tuple[int, Dict[Tuple[str, str], int]]:
+        network = self.network
+        u, v = network._index.get(from_node), network._index.get(to_node)
+        if u is None or v is None or network._edge_id(u, v) is None:
+            raise KeyError(f"Ребро {from_node} -> {to_node} відсутнє")
+        return self.set_capacity(from_node, to_node, 0)
+
+    def _rebuild(self):
+        """Перебудовує контекст на новому CSR, переносячи потоки ребер."""
+        old = self._context
+        old_capacities, old_residual = old.capacities, old.residual
+        old_edge_arc = old.csr.edge_arc
+
+        context = self._own_context(self.network._context(self.source, self.sink))
+        csr = context.csr
+        for k in range(len(old_edge_arc)):
+            old_arc = old_edge_arc[k]
+            flow = old_capacities[old_arc] - old_residual[old_arc]
+            arc = csr.edge_arc[k]
+            context.residual[arc] = context.capacities[arc] - flow
+            context.residual[csr.rev[arc]] = flow
+        self._context = context
+
+
+class GomoryHuTree:
+    """
+    Дерево Гоморі-Ху: мінімальний розріз між будь-якими двома вершинами
+    дорівнює найменшій вазі ребра на шляху між ними в дереві.
+    """
+
+    def __init__(self, names: List[str], parent: List[int], weight: List[int], infinite: int):
         """
-        Алгоритм Едмондса-Карпа для знаходження максимального потоку.
-        
+        Створює дерево з масивів батьків і ваг, отриманих алгоритмом Гасфілда.
+
         Args:
-            source: Вершина-джерело
-            sink: Вершина-стік
-            
+            names: Назви вершин за індексами
+            parent: Батько кожної вершини (корінь — вершина 0)
+            weight: Вага ребра до батька (величина мінімального розрізу)
+            infinite: Ємність, що позначає нескінченність у CSR
+        """
+        self._names = names
+        self._index = {name: i for i, name in enumerate(names)}
+        self._parent = parent
+        self._weight = weight
+        self._infinite = infinite
+
+        # Глибини вершин для підйому до спільного предка
+        n = len(names)
+        self._depth = [-1] * n
+        if n:
+            self._depth[0] = 0
+        for node in range(n):
+            chain = []
+            while self._depth[node] < 0:
+                chain.append(node)
+                node = parent[node]
+            depth = self._depth[node]
+            for other in reversed(chain):
+                depth += 1
+                self._depth[other] = depth
+
+    def edges(self) -> List[Tuple[str, str, int]]:
+        """
+        Повертає ребра дерева.
+
         Returns:
-            Кортеж (максимальний потік, словник потоків по ребрах)
+            Список трійок (вершина, батько, величина мінімального розрізу)
         """
-        parent = {}
-        max_flow = 0
-        flow_graph = defaultdict(lambda: defaultdict(int))
-        
-        # Створюємо копію графа для роботи
-        residual_graph = defaultdict(dict)
-        for node in self.graph:
-            for neighbor, capacity in self.graph[node].items():
-                residual_graph[node][neighbor] = capacity
-        
-        # Зберігаємо копію в об'єкті для використання в bfs
-        original_graph = self.graph
-        
-        while True:
-            self.graph = residual_graph
-            parent.clear()
-            
-            if not self.bfs(source, sink, parent):
-                break
-            
-            # Знаходимо мінімальну пропускну здатність на шляху
-            path_flow = float('inf')
-            s = sink
-            while s != source:
-                path_flow = min(path_flow, residual_graph[parent[s]][s])
-                s = parent[s]
-            
-            # Оновлюємо залишкові здатності ребер і зворотних ребер
-            v = sink
-            while v != source:
-                u = parent[v]
-                residual_graph[u][v] -= path_flow
-                residual_graph[v][u] += path_flow
-                
-                # Записуємо фактичний потік
-                if residual_graph[v][u] > 0 and original_graph[u].get(v, 0) > 0:
-                    flow_graph[u][v] = residual_graph[v][u]
-                
-                v = parent[v]
-            
-            max_flow += path_flow
-        
-        # Відновлюємо оригінальний граф
-        self.graph = original_graph
-        
-        return max_flow, dict(flow_graph)
+        return [(self._names[node], self._names[self._parent[node]], self._value(self._weight[node]))
+                for node in range(1, len(self._names))]
+
+    def max_flow(self, u: str, v: str) -> int:
+        """
+        Повертає величину максимального потоку (мінімального розрізу) між двома вершинами.
+
+        Args:
+            u: Перша вершина
+            v: Друга вершина
+
+        Returns:
+            Величина потоку (float('inf') для нескінченного)
+
+        Raises:
+            KeyError: Якщо вершини немає в дереві
+            ValueError: Якщо вершини збігаються
+        """
+        return self._value(min(self._weight[node] for node in self._path(self._index[u], self._index[v])))
+
+    def min_cut(self, u: str, v: str) -> Tuple[int, set]:
+        """
+        Повертає мінімальний розріз між двома вершинами.
+
+        Args:
+            u: Перша вершина
+            v: Друга вершина
+
+        Returns:
+            Кортеж (величина розрізу, множина вершин з боку u)
+
+        Raises:
+            KeyError: Якщо вершини немає в дереві
+            ValueError: Якщо вершини збігаються
+        """
+        a, b = self._index[u], self._index[v]
+        lightest = min(self._path(a, b), key=lambda node: self._weight[node])
+
+        # Видалення ребра (lightest, батько) розбиває дерево на дві частини
+        children = defaultdict(list)
+        for node in range(1, len(self._names)):
+            children[self._parent[node]].append(node)
+        subtree = {lightest}
+        stack = [lightest]
+        while stack:
+            for child in children[stack.pop()]:
+                subtree.add(child)
+                stack.append(child)
+        side = subtree if a in subtree else set(range(len(self._names))) - subtree
+        return self._value(self._weight[lightest]), {self._names[node] for node in side}
+
+    def _path(self, a: int, b: int) -> List[int]:
+        """
+        Знаходить вершини, ребра до батьків яких утворюють шлях між a та b.
+
+        Args:
+            a: Індекс першої вершини
+            b: Індекс другої вершини
+
+        Returns:
+            Список вершин (кожна представляє ребро до свого батька)
+
+        Raises:
+            ValueError: Якщо вершини збігаються
+        """
+        if a == b:
+            raise ValueError("Вершини повинні бути різними")
+        parent, depth = self._parent, self._depth
+        path = []
+        while a != b:
+            if depth[a] >= depth[b]:
+                path.append(a)
+                a = parent[a]
+            else:
+                path.append(b)
+                b = parent[b]
+        return path
+
+    def _value(self, weight: int) -> int:
+        """Перетворює вагу ребра на величину потоку з урахуванням нескінченності."""
+        return float('inf') if weight >= self._infinite else weight
+
+
+# Базова мережа побудови дерева Гоморі-Ху: (мережа, симетричний CSR, алгоритм)
+_gomory_hu_base = None
+
+
+def _set_gomory_hu_base(base: tuple):
+    """
+    Встановлює базову мережу побудови дерева Гоморі-Ху в процесі.
+
+    Args:
+        base: Кортеж (мережа, симетричний CSR, алгоритм) або None
+    """
+    global _gomory_hu_base
+    _gomory_hu_base = base
+
+
+def _gomory_hu_cut(pair: Tuple[int, int]) -> Tuple[int, bytes]:
+    """
+    Обчислює мінімальний розріз між парою вершин симетричної мережі.
+
+    Args:
+        pair: Індекси (вершина, її поточний батько в дереві)
+
+    Returns:
+        Кортеж (величина розрізу, маска вершин з боку першої вершини)
+    """
+    network, csr, algorithm = _gomory_hu_base
+    context = SolveContext(csr, pair[0], pair[1])
+    flow = network._run_solver(context, algorithm)
+    if context.visited is None:
+        network._bfs(context)
+    return flow, bytes(context.visited)
+
+
+def _gusfield_step(s: int, parent: List[int], weight: List[int], cut: Tuple[int, bytes]):
+    """
+    Застосовує розріз між s та parent[s] до дерева (крок алгоритму Гасфілда).
+
+    Args:
+        s: Індекс поточної вершини
+        parent: Батьки вершин (змінюється на місці)
+        weight: Ваги ребер до батьків (змінюється на місці)
+        cut: Кортеж (величина розрізу, маска вершин з боку s)
+    """
+    flow, side = cut
+    t = parent[s]
+    weight[s] = flow
+    for node in range(len(parent)):
+        if node != s and side[node] and parent[node] == t:
+            parent[node] = s
+    if side[parent[t]]:
+        parent[s] = parent[t]
+        parent[t] = s
+        weight[s] = weight[t]
+        weight[t] = flow
+
+
+def _gomory_hu_executor(base: tuple, max_workers: int) -> ProcessPoolExecutor:
+    """
+    Створює пул процесів, у кожному з яких доступна базова мережа.
+
+    Args:
+        base: Кортеж (мережа, симетричний CSR, алгоритм)
+        max_workers: Кількість процесів
+
+    Returns:
+        Пул процесів
+    """
+    mp_context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Через fork база успадковується без серіалізації
+        mp_context = multiprocessing.get_context("fork")
+    return ProcessPoolExecutor(
+        max_workers, mp_context=mp_context, initializer=_set_gomory_hu_base, initargs=(base,)
+    )
+
+
+def save_snapshot(path: str, network: MaxFlowNetwork, solver: IncrementalMaxFlow = None):
+    """
+    Зберігає мережу (і, за наявності, розв'язаний стан) у двійковий знімок.
+
+    Окрім ребер зберігається готовий CSR, тож під час завантаження його
+    не доводиться будувати заново.
+
+    Args:
+        path: Шлях до файлу
+        network: Мережа потоків
+        solver: Розв'язаний стан, що зберігається разом з мережею
+    """
+    if solver is not None:
+        context = solver._context
+        csr, capacities = context.csr, context.capacities
+        source, sink = context.source, context.sink
+        residual, max_flow = context.residual, solver.max_flow
+    else:
+        csr = network._csr_graph()
+        capacities = csr.caps
+        source = sink = -1
+        residual, max_flow = None, 0
+
+    names = "\0".join(network._names).encode("utf-8")
+    names += b"\0" * (-len(names) % 8)
+    columns = [
+        network._tails, network._heads, network._caps, network._costs,
+        csr.offsets, csr.heads, capacities, csr.rev, csr.costs, csr.edge_arc,
+    ]
+    if residual is not None:
+        columns.append(residual)
+
+    with open(path, "wb") as file:
+        file.write(SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, int(residual is not None),
+            len(network._names), len(network._tails), len(names),
+            csr.infinite, source, sink, max_flow
+        ))
+        file.write(names)
+        for column in columns:
+            if sys.byteorder == "big":
+                column = array('q', column)
+                column.byteswap()
+            column.tofile(file)
+
+
+def load_snapshot(path: str) -> Tuple[MaxFlowNetwork, IncrementalMaxFlow]:
+    """
+    Завантажує мережу та розв'язаний стан зі знімка через mmap.
+
+    Масиви копіюються з відображеного файлу цілими буферами без розбору
+    окремих записів; CSR відновлюється без перебудови.
+
+    Args:
+        path: Шлях до файлу
+
+    Returns:
+        Кортеж (мережа, розв'язаний стан або None)
+
+    Raises:
+        ValueError: Якщо файл не є знімком, має непідтримувану версію
+            або його довжина не відповідає заголовку
+    """
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) < SNAPSHOT_HEADER.size:
+                raise ValueError("Файл не є знімком мережі")
+            (magic, version, solved, num_nodes, num_edges, names_size,
+             infinite, source, sink, max_flow) = SNAPSHOT_HEADER.unpack_from(mapped)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError("Файл не є знімком мережі")
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"Непідтримувана версія знімка: {version}")
+            # Ребра мережі (4 стовпці), зсуви CSR, 4 стовпці дуг, прямі дуги
+            # та, для розв'язаного стану, залишкова мережа
+            items = 4 * num_edges + (num_nodes + 1) + 8 * num_edges + num_edges
+            if solved:
+                items += 2 * num_edges
+            if len(mapped) != SNAPSHOT_HEADER.size + names_size + 8 * items:
+                raise ValueError("Пошкоджений знімок мережі")
+
+            view = memoryview(mapped)
+            offset = SNAPSHOT_HEADER.size
+
+            def read_column(length: int) -> array:
+                """Копіює наступний стовпець int64 у масив."""
+                nonlocal offset
+                column = array('q')
+                column.frombytes(view[offset:offset + 8 * length])
+                if sys.byteorder == "big":
+                    column.byteswap()
+                offset += 8 * length
+                return column
+
+            try:
+                names = bytes(view[offset:offset + names_size]).rstrip(b"\0")
+                offset += names_size
+                network = MaxFlowNetwork()
+                network._names = names.decode("utf-8").split("\0") if num_nodes else []
+                network._index = {name: i for i, name in enumerate(network._names)}
+                network._edge_ids = None
+                network._tails = read_column(num_edges)
+                network._heads = read_column(num_edges)
+                network._caps = read_column(num_edges)
+                network._costs = read_column(num_edges)
+
+                csr = CSRGraph.__new__(CSRGraph)
+                csr.num_nodes = num_nodes
+                csr.infinite = infinite
+                csr.offsets = read_column(num_nodes + 1)
+                csr.heads = read_column(2 * num_edges)
+                capacities = read_column(2 * num_edges)
+                csr.rev = read_column(2 * num_edges)
+                csr.costs = read_column(2 * num_edges)
+                csr.edge_arc = read_column(num_edges)
+                residual = read_column(2 * num_edges) if solved else None
+            finally:
+                view.release()
+
+    csr.caps = capacities
+    network._csr = csr
+    if not solved:
+        return network, None
+
+    context = SolveContext(csr, source, sink)
+    context.residual = residual
+    solver = IncrementalMaxFlow.__new__(IncrementalMaxFlow)
+    solver.network = network
+    solver.source = network._names[source]
+    solver.sink = network._names[sink]
+    solver._context = solver._own_context(context)
+    solver.max_flow = max_flow
+    return network, solver
+
+
+# Базова мережа пакетного розв'язання: (мережа, джерело, стік, алгоритм).
+# Процеси-обробники отримують її через fork або один раз через initializer.
+_scenario_base = None
+
+
+def _init_scenario_worker(base: tuple):
+    """
+    Ініціалізує процес-обробник базовою мережею.
+
+    Args:
+        base: Кортеж (мережа, джерело, стік, алгоритм)
+    """
+    global _scenario_base
+    _scenario_base = base
+
+
+def _solve_scenario(deltas: Dict[Tuple[str, str], int]) -> int:
+    """
+    Розв'язує один сценарій на базовій мережі процесу.
+
+    Args:
+        deltas: Зміни ємностей {(від, до): приріст}
+
+    Returns:
+        Максимальний потік сценарію (float('inf') для шляху з нескінченних ребер)
+
+    Raises:
+        KeyError: Якщо ребра зі сценарію немає в мережі
+    """
+    network, source, sink, algorithm = _scenario_base
+    context = network._context(source, sink)
+    context.capacities = context.capacities[:]
+    csr = context.csr
+
+    growth = 0
+    for (from_node, to_node), delta in deltas.items():
+        u, v = network._index.get(from_node), network._index.get(to_node)
+        edge_id = None if u is None or v is None else network._edge_id(u, v)
+        if edge_id is None:
+            raise KeyError(f"Ребро {from_node} -> {to_node} відсутнє")
+        if network._caps[edge_id] == INFINITE_CAPACITY:
+            continue  # нескінченне ребро лишається нескінченним
+        arc = csr.edge_arc[edge_id]
+        capacity = max(0, context.capacities[arc] + delta)
+        growth += capacity - context.capacities[arc]
+        context.capacities[arc] = capacity
+        context.residual[arc] = capacity
+
+    if growth > 0:
+        # Межа нескінченності має перевищувати нову суму скінченних ємностей
+        for k, arc in enumerate(csr.edge_arc):
+            if network._caps[k] == INFINITE_CAPACITY:
+                context.capacities[arc] += growth
+                context.residual[arc] += growth
+
+    flow = network._run_solver(context, algorithm)
+    return float('inf') if flow >= csr.infinite + max(0, growth) else flow
+
+
+def solve_scenarios(
+    network: MaxFlowNetwork,
+    source: str,
+    sink: str,
+    scenarios: Dict[str, Dict[Tuple[str, str], int]],
+    algorithm: str = "auto",
+    max_workers: int = None,
+    start_method: str = None
+) -> List[Tuple[str, int]]:
+    """
+    Паралельно розв'язує набір сценаріїв зміни ємностей.
+
+    Базова мережа не серіалізується для кожного сценарію: процеси, запущені
+    через fork, успадковують її (разом із CSR) без копіювання, інакше
+    вона передається один раз на процес. Кожен сценарій — лише словник змін.
+
+    Args:
+        network: Базова мережа
+        source: Вершина-джерело
+        sink: Вершина-стік
+        scenarios: Сценарії {назва: {(від, до): приріст ємності}}
+        algorithm: Назва алгоритму (як у MaxFlowNetwork.solve)
+        max_workers: Кількість процесів (1 — розв'язання в поточному процесі)
+        start_method: Спосіб запуску процесів ("fork", "spawn", "forkserver");
+            None — типовий для платформи (fork не нав'язується там, де він
+            не типовий, як-от у macOS)
+
+    Returns:
+        Список пар (назва сценарію, максимальний потік) у порядку сценаріїв
+
+    Raises:
+        ValueError: Якщо джерело чи стік відсутні, алгоритм або спосіб
+            запуску невідомий
+    """
+    global _scenario_base
+
+    algorithm = network._resolve_algorithm(algorithm)
+    if network._context(source, sink) is None:
+        raise ValueError("Джерело та стік повинні бути різними вершинами мережі")
+
+    names = list(scenarios)
+    deltas = [scenarios[name] for name in names]
+    base = (network, source, sink, algorithm)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(deltas))
+
+    if max_workers <= 1:
+        _scenario_base = base
+        try:
+            flows = [_solve_scenario(scenario) for scenario in deltas]
+        finally:
+            _scenario_base = None
+        return list(zip(names, flows))
+
+    mp_context = multiprocessing.get_context(start_method)
+    chunksize = max(1, len(deltas) // (max_workers * 4))
+    if mp_context.get_start_method() == "fork":
+        # Дочірні процеси успадковують базову мережу через fork
+        _scenario_base = base
+        try:
+            with ProcessPoolExecutor(max_workers, mp_context=mp_context) as executor:
+                flows = list(executor.map(_solve_scenario, deltas, chunksize=chunksize))
+        finally:
+            _scenario_base = None
+    else:
+        with ProcessPoolExecutor(
+            max_workers, mp_context=mp_context, initializer=_init_scenario_worker, initargs=(base,)
+        ) as executor:
+            flows = list(executor.map(_solve_scenario, deltas, chunksize=chunksize))
+
+    return list(zip(names, flows))
+
+
+def print_scenario_table(results: List[Tuple[str, int]], base_flow: int):
+    """
+    Виводить таблицю максимальних потоків за сценаріями.
+
+    Args:
+        results: Пари (назва сценарію, максимальний потік)
+        base_flow: Максимальний потік базової мережі
+    """
+    print("\n" + "="*70)
+    print("СЦЕНАРІЇ ЗМІНИ ПРОПУСКНОЇ ЗДАТНОСТІ")
+    print("="*70)
+    print(f"{'Сценарій':<40} {'Потік':<15} {'Зміна':<15}")
+    print("-"*70)
+    for name, flow in results:
+        print(f"{name:<40} {flow:<15} {flow - base_flow:+}")
+    print("="*70)
 
 
 def create_logistics_network() -> MaxFlowNetwork:
@@ -165,6 +3137,13 @@ def create_logistics_network() -> MaxFlowNetwork:
 def add_super_source_and_sink(network: MaxFlowNetwork) -> Tuple[str, str]:
     """
     Додає супер-джерело та супер-стік до мережі.
+
+    Терміналами вважаються вершини без вхідних ребер, магазинами — без
+    вихідних. Допоміжні ребра нескінченні (INFINITE_CAPACITY): CSR
+    обмежує їх сумою поточних скінченних ємностей при кожній перебудові,
+    тож вони не обмежують потік і після зміни мережі та не потрапляють
+    у розріз.
+    Для розв'язання без допоміжних вершин див. multi_source_max_flow.
     
     Args:
         network: Мережа потоків
@@ -172,26 +3151,118 @@ def add_super_source_and_sink(network: MaxFlowNetwork) -> Tuple[str, str]:
     Returns:
         Кортеж (супер-джерело, супер-стік)
     """
-    super_source = "Супер-Джерело"
-    super_sink = "Супер-Стік"
-    
+    super_source = SUPER_SOURCE
+    super_sink = SUPER_SINK
+    terminals, stores = network.boundary_nodes()
+
     # З'єднуємо супер-джерело з терміналами
-    network.add_edge(super_source, "Термінал 1", float('inf'))
-    network.add_edge(super_source, "Термінал 2", float('inf'))
-    
+    for terminal in terminals:
+        network.add_edge(super_source, terminal, float('inf'))
+
     # З'єднуємо магазини з супер-стоком
-    for i in range(1, 15):
-        network.add_edge(f"Магазин {i}", super_sink, float('inf'))
+    for store in stores:
+        network.add_edge(store, super_sink, float('inf'))
     
     return super_source, super_sink
 
 
+def decompose_flow(
+    flow_graph: Dict[str, Dict[str, int]],
+    sources,
+    sinks
+) -> List[Tuple[List[str], int]]:
+    """
+    Розкладає потік на шляхи від джерел до стоків.
+
+    Кожен крок іде першим ребром із залишком потоку (з покажчиком на
+    поточне ребро вершини), тож кожен знайдений шлях або цикл вичерпує
+    щонайменше одне ребро. Цикли потоку скасовуються і в результат
+    не потрапляють. Складність O(E · кількість шляхів).
+
+    Args:
+        flow_graph: Словник потоків по ребрах
+        sources: Джерело або колекція джерел
+        sinks: Стік або колекція стоків
+
+    Returns:
+        Список пар (шлях як список вершин, величина потоку)
+    """
+    if isinstance(sources, str):
+        sources = [sources]
+    sinks = {sinks} if isinstance(sinks, str) else set(sinks)
+
+    # Залишки потоку: для кожної вершини список [сусід, потік]
+    remaining = {
+        node: [[neighbor, flow] for neighbor, flow in neighbors.items() if flow > 0]
+        for node, neighbors in flow_graph.items()
+    }
+    pointer = dict.fromkeys(remaining, 0)
+
+    def next_edge(node):
+        """Повертає перше ребро вершини із залишком потоку або None."""
+        edges = remaining.get(node)
+        if edges is None:
+            return None
+        while pointer[node] < len(edges):
+            edge = edges[pointer[node]]
+            if edge[1] > 0:
+                return edge
+            pointer[node] += 1
+        return None
+
+    paths = []
+    for source in sources:
+        while next_edge(source) is not None:
+            path = [source]
+            edges = []
+            position = {source: 0}
+            node = source
+
+            while node not in sinks or node == source:
+                edge = next_edge(node)
+                if edge is None:
+                    break
+                neighbor = edge[0]
+                if neighbor in position:
+                    # Цикл потоку: скасовуємо його та повертаємося до його початку
+                    start = position[neighbor]
+                    cycle = edges[start:] + [edge]
+                    amount = min(e[1] for e in cycle)
+                    for e in cycle:
+                        e[1] -= amount
+                    for dropped in path[start + 1:]:
+                        del position[dropped]
+                    del path[start + 1:]
+                    del edges[start:]
+                    node = neighbor
+                    continue
+                position[neighbor] = len(path)
+                path.append(neighbor)
+                edges.append(edge)
+                node = neighbor
+
+            if node not in sinks or not edges:
+                # Потік, що не дійшов до стоку (зайвий залишок), не розкладається
+                break
+            amount = min(e[1] for e in edges)
+            for e in edges:
+                e[1] -= amount
+            paths.append((path, amount))
+
+    return paths
+
+
 def calculate_terminal_to_store_flows(
     flow_graph: Dict[Tuple[str, str], int],
     network: MaxFlowNetwork
 ) -> Dict[Tuple[str, str], int]:
     """
     Обчислює потоки від терміналів до магазинів через склади.
+
+    Потік розкладається на точні шляхи, тому таблиця в сумі дає рівно
+    максимальний потік для будь-якої кількості рівнів і вершин. Терміналом
+    вважається перша, а магазином — остання вершина шляху (без супер-джерела
+    та супер-стоку).
     
     Args:
         flow_graph: Словник потоків по ребрах
@@ -201,35 +3272,19 @@ def calculate_terminal_to_store_flows(
         Словник потоків від терміналів до магазинів
     """
     terminal_to_store = defaultdict(int)
-    
-    # Для кожного магазину знаходимо, скільки товару надходить від кожного термінала
-    for store_num in range(1, 15):
-        store = f"Магазин {store_num}"
-        
-        # Знаходимо склад, який постачає цей магазин
-        for warehouse_num in range(1, 5):
-            warehouse = f"Склад {warehouse_num}"
-            
-            # Потік від складу до магазину
-            warehouse_to_store_flow = flow_graph.get(warehouse, {}).get(store, 0)
-            
-            if warehouse_to_store_flow > 0:
-                # Знаходимо термінали, які постачають цей склад
-                terminal1_to_warehouse = flow_graph.get("Термінал 1", {}).get(warehouse, 0)
-                terminal2_to_warehouse = flow_graph.get("Термінал 2", {}).get(warehouse, 0)
-                
-                total_to_warehouse = terminal1_to_warehouse + terminal2_to_warehouse
-                
-                if total_to_warehouse > 0:
-                    # Розподіляємо пропорційно
-                    if terminal1_to_warehouse > 0:
-                        proportion = terminal1_to_warehouse / total_to_warehouse
-                        terminal_to_store[("Термінал 1", store)] += int(warehouse_to_store_flow * proportion)
-                    
-                    if terminal2_to_warehouse > 0:
-                        proportion = terminal2_to_warehouse / total_to_warehouse
-                        terminal_to_store[("Термінал 2", store)] += int(warehouse_to_store_flow * proportion)
-    
+
+    # Джерела не мають вхідного потоку, стоки — вихідного
+    has_inflow = {node for neighbors in flow_graph.values() for node in neighbors}
+    sources = [node for node in flow_graph if node not in has_inflow]
+    sinks = [node for node in has_inflow if not flow_graph.get(node)]
+
+    for path, amount in decompose_flow(flow_graph, sources, sinks):
+        if path[0] == SUPER_SOURCE:
+            path = path[1:]
+        if path[-1] == SUPER_SINK:
+            path = path[:-1]
+        terminal_to_store[(path[0], path[-1])] += amount
+
     return dict(terminal_to_store)
 
 
@@ -262,14 +3317,20 @@ def print_flow_table(flow_graph: Dict[Tuple[str, str], int]):
     print("="*70)
 
 
-def print_detailed_flows(flow_graph: Dict[Tuple[str, str], int], network: MaxFlowNetwork):
+def print_detailed_flows(result: FlowResult, network: MaxFlowNetwork):
     """
     Виводить детальну інформацію про потоки в мережі.
+
+    Термінали та магазини визначаються за структурою мережі
+    (MaxFlowNetwork.boundary_nodes), а суми беруться з індексів FlowResult.
     
     Args:
-        flow_graph: Словник потоків по ребрах
+        result: Результат розв'язання
         network: Мережа потоків
     """
+    terminals, stores = network.boundary_nodes()
+    store_set = set(stores)
+
     print("\n" + "="*70)
     print("ДЕТАЛЬНИЙ АНАЛІЗ ПОТОКІВ")
     print("="*70)
@@ -280,18 +3341,17 @@ def print_detailed_flows(flow_graph: Dict[Tuple[str, str], int], network: MaxFlo
     print(f"{'Від':<20} {'До':<20} {'Потік/Ємність':<20}")
     print("-"*70)
     
-    terminal_total = defaultdict(int)
-    for terminal in ["Термінал 1", "Термінал 2"]:
-        for warehouse in [f"Склад {i}" for i in range(1, 5)]:
-            capacity = network.graph[terminal].get(warehouse, 0)
-            flow = flow_graph.get(terminal, {}).get(warehouse, 0)
-            if capacity > 0:
+    warehouses = []
+    for terminal in terminals:
+        for _, warehouse, capacity, flow, _ in result.out_edges(terminal):
+            if capacity > 0 and warehouse not in store_set:
                 print(f"{terminal:<20} {warehouse:<20} {flow}/{capacity}")
-                terminal_total[terminal] += flow
+                if warehouse not in warehouses:
+                    warehouses.append(warehouse)
     
     print("-"*70)
-    for terminal, total in terminal_total.items():
-        print(f"{terminal}: {total} одиниць")
+    for terminal in terminals:
+        print(f"{terminal}: {result.outflow(terminal)} одиниць")
     
     # Потоки від складів до магазинів
     print("\n2. Потоки від складів до магазинів:")
@@ -299,35 +3359,36 @@ def print_detailed_flows(flow_graph: Dict[Tuple[str, str], int], network: MaxFlo
     print(f"{'Від':<20} {'До':<20} {'Потік/Ємність':<20}")
     print("-"*70)
     
-    warehouse_total = defaultdict(int)
-    for warehouse in [f"Склад {i}" for i in range(1, 5)]:
-        for store_num in range(1, 15):
-            store = f"Магазин {store_num}"
-            capacity = network.graph[warehouse].get(store, 0)
-            flow = flow_graph.get(warehouse, {}).get(store, 0)
-            if capacity > 0:
+    for warehouse in warehouses:
+        for _, store, capacity, flow, _ in result.out_edges(warehouse):
+            if capacity > 0 and store in store_set:
                 print(f"{warehouse:<20} {store:<20} {flow}/{capacity}")
-                warehouse_total[warehouse] += flow
     
     print("-"*70)
-    for warehouse, total in warehouse_total.items():
-        print(f"{warehouse}: {total} одиниць")
+    for warehouse in warehouses:
+        print(f"{warehouse}: {result.outflow(warehouse)} одиниць")
 
 
 def analyze_results(
     max_flow: int,
-    flow_graph: Dict[Tuple[str, str], int],
+    result: FlowResult,
     network: MaxFlowNetwork,
-    terminal_to_store: Dict[Tuple[str, str], int]
+    terminal_to_store: Dict[Tuple[str, str], int],
+    cut_edges: List[Tuple[str, str]] = None,
+    sensitivity: List[Tuple[str, str, bool, int]] = None
 ):
     """
     Аналізує результати обчислення максимального потоку.
     
     Args:
         max_flow: Максимальний потік
-        flow_graph: Словник потоків по ребрах
+        result: Результат розв'язання
         network: Мережа потоків
         terminal_to_store: Словник потоків від терміналів до магазинів
+        cut_edges: Ребра мінімального розрізу; якщо задані, вузькими місцями
+            вважаються саме вони, а не всі повністю завантажені ребра
+        sensitivity: Результат MaxFlowNetwork.edge_sensitivity; якщо заданий,
+            рекомендації будуються за приростом потоку від розширення ребер
     """
     print("\n" + "="*70)
     print("АНАЛІЗ РЕЗУЛЬТАТІВ")
@@ -339,11 +3400,8 @@ def analyze_results(
     print("\n1. Які термінали забезпечують найбільший потік товарів до магазинів?")
     print("-"*70)
     
-    terminal_totals = defaultdict(int)
-    for terminal in ["Термінал 1", "Термінал 2"]:
-        for warehouse in [f"Склад {i}" for i in range(1, 5)]:
-            flow = flow_graph.get(terminal, {}).get(warehouse, 0)
-            terminal_totals[terminal] += flow
+    terminals, stores = network.boundary_nodes()
+    terminal_totals = {terminal: result.outflow(terminal) for terminal in terminals}
     
     for terminal, total in sorted(terminal_totals.items(), key=lambda x: x[1], reverse=True):
         print(f"   {terminal}: {total} одиниць")
@@ -355,26 +3413,30 @@ def analyze_results(
     print("\n2. Які маршрути мають найменшу пропускну здатність і як це впливає на загальний потік?")
     print("-"*70)
     
-    bottlenecks = []
-    for from_node in network.graph:
-        if from_node not in ["Супер-Джерело"]:
-            for to_node, capacity in network.graph[from_node].items():
-                if to_node not in ["Супер-Стік"] and capacity < float('inf'):
-                    flow = flow_graph.get(from_node, {}).get(to_node, 0)
-                    utilization = (flow / capacity * 100) if capacity > 0 else 0
-                    bottlenecks.append((from_node, to_node, capacity, flow, utilization))
-    
-    # Сортуємо за пропускною здатністю
-    bottlenecks.sort(key=lambda x: x[2])
+    # Ребра вже відсортовані за пропускною здатністю в індексі результату
+    bottlenecks = [
+        edge for edge in result.lowest_capacity_edges()
+        if edge[0] != SUPER_SOURCE and edge[1] != SUPER_SINK
+    ]
     
     print("   Маршрути з найменшою пропускною здатністю:")
     for from_node, to_node, capacity, flow, utilization in bottlenecks[:5]:
         print(f"   {from_node} -> {to_node}: {capacity} од. (використано {flow}, {utilization:.1f}%)")
     
-    # Знаходимо повністю завантажені маршрути
-    fully_loaded = [(f, t, c, fl) for f, t, c, fl, u in bottlenecks if u >= 99.9]
+    if cut_edges is not None:
+        # Точні вузькі місця: ребра мінімального розрізу
+        cut = set(cut_edges)
+        fully_loaded = [(f, t, c, fl) for f, t, c, fl, _ in result.edges() if (f, t) in cut]
+        title = "Вузькі місця (ребра мінімального розрізу)"
+    else:
+        # Повністю завантажені маршрути
+        fully_loaded = [
+            (f, t, c, fl) for f, t, c, fl, _ in result.saturated_edges()
+            if f != SUPER_SOURCE and t != SUPER_SINK
+        ]
+        title = "Вузькі місця (повністю завантажені маршрути)"
     if fully_loaded:
-        print(f"\n   Вузькі місця (повністю завантажені маршрути): {len(fully_loaded)}")
+        print(f"\n   {title}: {len(fully_loaded)}")
         for from_node, to_node, capacity, flow in fully_loaded:
             print(f"   {from_node} -> {to_node}: {capacity} од.")
     
@@ -382,27 +3444,17 @@ def analyze_results(
     print("\n3. Які магазини отримали найменше товарів і чи можна збільшити їх постачання?")
     print("-"*70)
     
-    store_totals = defaultdict(int)
-    for store_num in range(1, 15):
-        store = f"Магазин {store_num}"
-        for warehouse in [f"Склад {i}" for i in range(1, 5)]:
-            flow = flow_graph.get(warehouse, {}).get(store, 0)
-            store_totals[store] += flow
-    
-    sorted_stores = sorted(store_totals.items(), key=lambda x: x[1])
+    sorted_stores = sorted(((store, result.inflow(store)) for store in stores), key=lambda x: x[1])
     
     print("   Магазини з найменшим постачанням:")
     for store, total in sorted_stores[:5]:
         print(f"   {store}: {total} одиниць")
         
         # Перевіряємо можливість збільшення
-        for warehouse in [f"Склад {i}" for i in range(1, 5)]:
-            capacity = network.graph[warehouse].get(store, 0)
-            flow = flow_graph.get(warehouse, {}).get(store, 0)
-            if capacity > 0:
-                available = capacity - flow
-                if available > 0:
-                    print(f"      - Можна збільшити через {warehouse}: +{available} од.")
+        for warehouse, _, capacity, flow, _ in result.in_edges(store):
+            available = capacity - flow
+            if available > 0:
+                print(f"      - Можна збільшити через {warehouse}: +{available} од.")
     
     # Питання 4: Чи є вузькі місця?
     print("\n4. Чи є вузькі місця, які можна усунути для покращення ефективності?")
@@ -413,10 +3465,24 @@ def analyze_results(
         for from_node, to_node, capacity, flow in fully_loaded:
             print(f"   • {from_node} -> {to_node} (ємність: {capacity} од.)")
         
-        print("\n   Рекомендації:")
-        print("   - Збільшити пропускну здатність повністю завантажених маршрутів")
-        print("   - Розглянути альтернативні маршрути постачання")
-        print("   - Оптимізувати розподіл товарів між складами")
+        if sensitivity is not None:
+            upgrades = [
+                (from_node, to_node, gain) for from_node, to_node, critical, gain in sensitivity
+                if critical and from_node != SUPER_SOURCE and to_node != SUPER_SINK
+            ]
+            print("\n   Рекомендації (приріст потоку від розширення маршруту):")
+            if upgrades:
+                for from_node, to_node, gain in upgrades:
+                    amount = "без обмежень" if gain == float('inf') else f"до +{gain} од."
+                    print(f"   • {from_node} -> {to_node}: {amount}")
+            else:
+                print("   Розширення жодного окремого маршруту не збільшить потік;")
+                print("   потрібно розширювати кілька маршрутів одночасно.")
+        else:
+            print("\n   Рекомендації:")
+            print("   - Збільшити пропускну здатність повністю завантажених маршрутів")
+            print("   - Розглянути альтернативні маршрути постачання")
+            print("   - Оптимізувати розподіл товарів між складами")
     else:
         print("   Критичних вузьких місць не виявлено.")
         print("   Мережа працює з резервом пропускної здатності.")
@@ -426,30 +3492,47 @@ def main():
     """Головна функція програми."""
     print("="*70)
     print("ЛОГІСТИЧНА МЕРЕЖА: АНАЛІЗ МАКСИМАЛЬНОГО ПОТОКУ")
-    print("Алгоритм Едмондса-Карпа")
+    print("Багатоджерельний Едмондс-Карп: BFS одразу від усіх терміналів до магазинів")
     print("="*70)
     
     # Створюємо мережу
     network = create_logistics_network()
     
-    # Додаємо супер-джерело та супер-стік
-    super_source, super_sink = add_super_source_and_sink(network)
+    # Термінали — вершини без вхідних ребер, магазини — без вихідних
+    terminals, stores = network.boundary_nodes()
     
     # Обчислюємо максимальний потік
     print("\nОбчислення максимального потоку...")
-    max_flow, flow_graph = network.edmonds_karp(super_source, super_sink)
+    result = network.multi_source_max_flow(terminals, stores, with_min_cut=True)
     
     # Виводимо детальну інформацію
-    print_detailed_flows(flow_graph, network)
+    print_detailed_flows(result, network)
     
     # Обчислюємо потоки від терміналів до магазинів
-    terminal_to_store = calculate_terminal_to_store_flows(flow_graph, network)
+    terminal_to_store = calculate_terminal_to_store_flows(result.flow_graph, network)
     
     # Виводимо таблицю потоків
     print_flow_table(terminal_to_store)
     
+    # Чутливість ребер рахуємо на окремій копії мережі з супер-вершинами
+    extended = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(extended)
+    sensitivity = extended.edge_sensitivity(super_source, super_sink)
+    
     # Аналізуємо результати
-    analyze_results(max_flow, flow_graph, network, terminal_to_store)
+    analyze_results(result.max_flow, result, network, terminal_to_store, result.cut_edges, sensitivity)
+    
+    # Перевіряємо рекомендації пакетом сценаріїв: кожне розширення окремо та всі разом
+    upgrades = {
+        (from_node, to_node): gain for from_node, to_node, critical, gain in sensitivity
+        if critical and 0 < gain < float('inf') and from_node != super_source and to_node != super_sink
+    }
+    scenarios = {f"{from_node} -> {to_node} +{gain}": {(from_node, to_node): gain}
+                 for (from_node, to_node), gain in upgrades.items()}
+    if len(upgrades) > 1:
+        scenarios["Усі рекомендації разом"] = upgrades
+    if scenarios:
+        print_scenario_table(solve_scenarios(extended, super_source, super_sink, scenarios), result.max_flow)
     
     print("\n" + "="*70)
     print("ЗАВЕРШЕННЯ АНАЛІЗУ")
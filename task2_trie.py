@@ -9,6 +9,30 @@ from trie import Trie, TrieNode
 class Homework(Trie):
     """Розширений клас Trie з додатковими методами."""
     
+    def __init__(self, suffix_index: bool = False):
+        """
+        Ініціалізація дерева.
+        
+        Args:
+            suffix_index: Підтримувати дерево обернених ключів для підрахунку
+                суфіксів за O(|pattern|) ціною додаткової пам'яті
+        """
+        super().__init__()
+        self._suffix_root = TrieNode() if suffix_index else None
+    
+    def put(self, key: str, value) -> None:
+        """
+        Додає ключ-значення до дерева та до індексу суфіксів (якщо увімкнено).
+        
+        Args:
+            key: Рядок-ключ
+            value: Значення для збереження
+        """
+        words_before = self.root.word_count
+        super().put(key, value)
+        if self._suffix_root is not None and self.root.word_count != words_before:
+            self._index_suffix(key)
+    
     def count_words_with_suffix(self, pattern: str) -> int:
         """
         Підраховує кількість слів, що закінчуються заданим суфіксом.
@@ -30,6 +54,15 @@ class Homework(Trie):
         if not pattern:
             raise ValueError("Параметр pattern не може бути порожнім рядком")
         
+        # З індексом суфіксів достатньо пройти обернений шаблон
+        if self._suffix_root is not None:
+            node = self._suffix_root
+            for char in reversed(pattern):
+                node = node.child(char)
+                if node is None:
+                    return 0
+            return node.word_count
+        
         # Збираємо всі слова з дерева
         all_words = []
         self._collect_all_words(self.root, "", all_words)
@@ -52,6 +85,25 @@ class Homework(Trie):
         Returns:
             True, якщо існує хоча б одне слово з префіксом, інакше False
             
+        Raises:
+            TypeError: Якщо prefix не є рядком
+            ValueError: Якщо prefix є порожнім рядком
+        """
+        return self.count_words_with_prefix(prefix) > 0
+    
+    def count_words_with_prefix(self, prefix: str) -> int:
+        """
+        Підраховує кількість слів із заданим префіксом.
+        
+        Відповідь береться з лічильника слів вузла префікса, тому час
+        залежить лише від довжини префікса.
+        
+        Args:
+            prefix: Префікс для пошуку (регістрозалежний)
+            
+        Returns:
+            Кількість слів з заданим префіксом
+            
         Raises:
             TypeError: Якщо prefix не є рядком
             ValueError: Якщо prefix є порожнім рядком
@@ -66,12 +118,29 @@ class Homework(Trie):
         # Проходимо по дереву відповідно до префікса
         node = self.root
         for char in prefix:
-            if char not in node.children:
-                return False
-            node = node.children[char]
+            node = node.child(char)
+            if node is None:
+                return 0
         
-        # Перевіряємо, чи існує хоча б одне слово з цим префіксом
-        return self._has_words_from_node(node)
+        return node.word_count
+    
+    def _index_suffix(self, key: str) -> None:
+        """
+        Додає новий ключ до дерева обернених ключів.
+        
+        Кожен вузол на шляху зберігає кількість слів, що закінчуються
+        відповідним суфіксом.
+        
+        Args:
+            key: Новий рядок-ключ
+        """
+        node = self._suffix_root
+        node.word_count += 1
+        for char in reversed(key):
+            child = node.add_child(char)
+            child.word_count += 1
+            node = child
+        node.is_end_of_word = True
     
     def _collect_all_words(self, node: TrieNode, current_word: str, result: list) -> None:
         """
@@ -85,29 +154,8 @@ class Homework(Trie):
         if node.is_end_of_word:
             result.append(current_word)
         
-        for char, child_node in node.children.items():
+        for char, child_node in node.child_items():
             self._collect_all_words(child_node, current_word + char, result)
-    
-    def _has_words_from_node(self, node: TrieNode) -> bool:
-        """
-        Перевіряє, чи існують слова, що починаються з даного вузла.
-        
-        Args:
-            node: Вузол для перевірки
-            
-        Returns:
-            True, якщо існує хоча б одне слово, інакше False
-        """
-        # Якщо це кінець слова, повертаємо True
-        if node.is_end_of_word:
-            return True
-        
-        # Перевіряємо дочірні вузли
-        for child_node in node.children.values():
-            if self._has_words_from_node(child_node):
-                return True
-        
-        return False
 
 
 def run_basic_tests():
@@ -336,6 +384,22 @@ def run_performance_tests():
     print(f"✓ Слів з суфіксом 'a': {count}")
     print(f"✓ Час виконання: {elapsed:.4f} секунд")
     
+    # Тест 5: Індекс суфіксів
+    print("\n5. Пошук суфіксів з індексом у 10,000 слів:")
+    print("-"*70)
+    indexed = Homework(suffix_index=True)
+    start = time.time()
+    for i in range(10000):
+        indexed.put(f"word{i:05d}", i)
+    elapsed = time.time() - start
+    print(f"✓ Додавання з індексом: {elapsed:.4f} секунд")
+    start = time.time()
+    result = indexed.count_words_with_suffix("00")
+    elapsed = time.time() - start
+    assert result == trie.count_words_with_suffix("00"), "Помилка: індекс суфіксів"
+    print(f"✓ Знайдено слів: {result}")
+    print(f"✓ Час виконання: {elapsed:.6f} секунд")
+    
     print("\n" + "="*70)
     print("✓ ТЕСТИ ПРОДУКТИВНОСТІ ЗАВЕРШЕНІ!")
     print("="*70)
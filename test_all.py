@@ -28,6 +28,639 @@ def test_task1():
     return True
 
 
+def test_dinic():
+    """Тест алгоритму Дініца."""
+    from task1_max_flow import create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+
+    max_flow, flow_graph = network.dinic(super_source, super_sink)
+    assert max_flow == 115, f"Очікувався потік 115, отримано {max_flow}"
+    assert network.solve(super_source, super_sink, algorithm="dinic")[0] == 115
+
+    # Потік зберігається в кожному складі
+    for i in range(1, 5):
+        warehouse = f"Склад {i}"
+        inflow = sum(flows.get(warehouse, 0) for flows in flow_graph.values())
+        outflow = sum(flow_graph.get(warehouse, {}).values())
+        assert inflow == outflow, f"Порушено збереження потоку у {warehouse}"
+    print("✓ Алгоритм Дініца: потік = 115 одиниць")
+
+
+def test_push_relabel():
+    """Тест алгоритму проштовхування передпотоку."""
+    from task1_max_flow import MaxFlowNetwork, create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+
+    for strategy in ("fifo", "highest"):
+        max_flow, _ = network.push_relabel(super_source, super_sink, strategy=strategy)
+        assert max_flow == 115, f"Очікувався потік 115 ({strategy}), отримано {max_flow}"
+    assert network.solve(super_source, super_sink, algorithm="auto")[0] == 115
+
+    # Повний граф: "auto" обирає push-relabel
+    dense = MaxFlowNetwork()
+    for u in range(5):
+        for v in range(5):
+            if u != v:
+                dense.add_edge(f"v{u}", f"v{v}", u + v)
+    assert dense.density() == 1.0
+    assert dense.solve("v0", "v4", algorithm="auto")[0] == dense.edmonds_karp("v0", "v4")[0]
+    print("✓ Push-relabel: потік = 115 одиниць")
+
+
+def test_csr_representation():
+    """Тест компактного цілочислового представлення графа."""
+    from task1_max_flow import MaxFlowNetwork
+
+    network = MaxFlowNetwork()
+    network.add_edge("A", "B", 5)
+    network.add_edge("B", "C", 3)
+    network.add_edge("A", "B", 7)  # повторне ребро замінює ємність
+    network.add_edge("C", "D", float('inf'))
+
+    assert network.nodes == {"A", "B", "C", "D"}
+    assert network.graph["A"]["B"] == 7
+    assert network.graph["B"]["A"] == 0
+    assert network.graph["C"]["D"] == float('inf')
+    # Словник кешується до зміни мережі
+    assert network.graph is network.graph
+    cached = network.graph
+    network.add_edge("D", "E", 2)
+    assert network.graph is not cached and network.graph["D"]["E"] == 2
+
+    max_flow, flow_graph = network.edmonds_karp("A", "D")
+    assert max_flow == 3 and isinstance(max_flow, int)
+    assert flow_graph == {"A": {"B": 3}, "B": {"C": 3}, "C": {"D": 3}}
+
+    try:
+        network.add_edge("A", "C", -1)
+        assert False, "Має бути ValueError"
+    except ValueError:
+        pass
+    print("✓ CSR-представлення: ребра та потоки коректні")
+
+
+def test_unbounded_flow():
+    """Тест: шлях із нескінченних ребер дає нескінченний потік."""
+    from task1_max_flow import MaxFlowNetwork, solve_scenarios
+
+    network = MaxFlowNetwork()
+    for u, v in [("S", "A"), ("A", "B"), ("B", "T")]:
+        network.add_edge(u, v, float('inf'))
+    for algorithm in ("edmonds_karp", "capacity_scaling", "dinic", "push_relabel"):
+        assert network.solve("S", "T", algorithm).max_flow == float('inf'), algorithm
+    assert network.solve_with_min_cut("S", "T")[0] == float('inf')
+
+    network.add_edge("S", "T", float('inf'))
+    network.add_edge("A", "C", 7)
+    network.add_edge("C", "T", 5)
+    assert network.solve("S", "T")[0] == float('inf')
+    assert network.solve("A", "C")[0] == 7
+    results = solve_scenarios(network, "S", "T", {"Без змін": {}, "C -> T +100": {("C", "T"): 100}}, max_workers=1)
+    assert [flow for _, flow in results] == [float('inf')] * 2
+    print("✓ Необмежений потік: float('inf')")
+
+
+def test_parallel_solves():
+    """Тест паралельних розв'язань на одній мережі."""
+    from concurrent.futures import ThreadPoolExecutor
+    from task1_max_flow import create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+    capacities_before = {u: dict(targets) for u, targets in network.graph.items()}
+
+    algorithms = ["edmonds_karp", "dinic", "push_relabel"] * 8
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda algorithm: network.solve(super_source, super_sink, algorithm)[0],
+            algorithms
+        ))
+
+    assert results == [115] * len(algorithms), f"Отримано {results}"
+    assert network.graph == capacities_before, "Мережа змінилася під час розв'язання"
+    print("✓ Паралельні розв'язання: мережа не змінюється")
+
+
+def test_incremental_max_flow():
+    """Тест відновлення потоку після зміни ємностей."""
+    from task1_max_flow import IncrementalMaxFlow, create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+    solver = IncrementalMaxFlow(network, super_source, super_sink)
+    assert solver.max_flow == 115
+
+    # Вантажівка випала з маршруту: ємність зменшується нижче потоку
+    assert solver.set_capacity("Термінал 2", "Склад 4", 20) == network.edmonds_karp(super_source, super_sink)[0]
+    assert solver.set_capacity("Термінал 2", "Склад 4", 30) == 115
+    assert solver.remove_edge("Склад 1", "Магазин 3") == network.edmonds_karp(super_source, super_sink)[0]
+    assert solver.add_edge("Термінал 1", "Склад 4", 10) == network.edmonds_karp(super_source, super_sink)[0]
+    print(f"✓ Інкрементальний потік: {solver.max_flow} одиниць після змін")
+
+
+def test_incremental_infinite_edges():
+    """Тест: межа нескінченних ребер зростає разом зі скінченними ємностями."""
+    from task1_max_flow import IncrementalMaxFlow, MaxFlowNetwork
+
+    network = MaxFlowNetwork()
+    network.add_edge("S", "A", float('inf'))
+    network.add_edge("A", "T", 10)
+    solver = IncrementalMaxFlow(network, "S", "T")
+    assert solver.max_flow == 10
+    assert solver.set_capacity("A", "T", 100) == 100
+    assert solver.set_capacity("A", "T", 40) == 40
+    # Нескінченне ребро стає скінченним
+    network.add_edge("A", "T", 1000)
+    solver = IncrementalMaxFlow(network, "S", "T")
+    assert solver.set_capacity("S", "A", 300) == 300
+    assert solver.set_capacity("S", "A", 5000) == network.solve("S", "T").max_flow == 1000
+    print("✓ Інкрементальний потік із нескінченними ребрами")
+
+
+def test_scenarios():
+    """Тест пакетного розв'язання сценаріїв."""
+    from task1_max_flow import solve_scenarios, create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+    scenarios = {
+        "Без змін": {},
+        "Термінал 2 -> Склад 4 +10": {("Термінал 2", "Склад 4"): 10},
+        "Термінал 1 -> Склад 1 -25": {("Термінал 1", "Склад 1"): -25},
+    }
+
+    results = solve_scenarios(network, super_source, super_sink, scenarios, max_workers=2)
+    assert results == solve_scenarios(network, super_source, super_sink, scenarios, max_workers=1)
+    # Без fork база передається процесам один раз через initializer
+    assert results == solve_scenarios(network, super_source, super_sink, scenarios,
+                                      max_workers=2, start_method="spawn")
+    assert [flow for _, flow in results] == [115, 125, 90], f"Отримано {results}"
+    print("✓ Сценарії: 3 розв'язання у пулі процесів")
+
+    # Прирости, що перевищують суму базових ємностей, не впираються
+    # в межу нескінченних ребер супер-вершин
+    base = create_logistics_network()
+    upgraded = {(u, v): 1000 for u, targets in base.graph.items() for v, capacity in targets.items() if capacity}
+    expected = create_logistics_network()
+    for (from_node, to_node), delta in upgraded.items():
+        expected.add_edge(from_node, to_node, base.graph[from_node][to_node] + delta)
+    expected_source, expected_sink = add_super_source_and_sink(expected)
+    expected_flow = expected.solve(expected_source, expected_sink).max_flow
+    [(_, flow)] = solve_scenarios(network, super_source, super_sink, {"+1000": upgraded}, max_workers=1)
+    assert flow == expected_flow == 6115, f"Отримано {flow}, очікувалось {expected_flow}"
+    print(f"✓ Сценарій +1000 на кожному маршруті: потік = {flow} одиниць")
+
+
+def test_min_cut():
+    """Тест виділення мінімального розрізу."""
+    from task1_max_flow import create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+    graph = network.graph
+
+    for algorithm in ("edmonds_karp", "dinic", "push_relabel"):
+        max_flow, _, source_side, cut_edges = network.solve_with_min_cut(super_source, super_sink, algorithm)
+        assert super_source in source_side and super_sink not in source_side
+        cut_capacity = sum(graph[u][v] for u, v in cut_edges)
+        assert cut_capacity == max_flow == 115, f"{algorithm}: розріз {cut_capacity}, потік {max_flow}"
+
+    source_side, cut_edges = network.min_cut(super_source, super_sink)
+    assert ("Термінал 2", "Склад 4") in cut_edges
+    print(f"✓ Мінімальний розріз: {len(cut_edges)} ребер, ємність 115")
+
+
+def test_flow_decomposition():
+    """Тест точного розкладу потоку на шляхи."""
+    from task1_max_flow import (
+        decompose_flow, calculate_terminal_to_store_flows,
+        create_logistics_network, add_super_source_and_sink
+    )
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+    max_flow, flow_graph = network.edmonds_karp(super_source, super_sink)
+
+    paths = decompose_flow(flow_graph, super_source, super_sink)
+    assert sum(amount for _, amount in paths) == max_flow
+    assert all(path[0] == super_source and path[-1] == super_sink for path, _ in paths)
+
+    # Таблиця термінал-магазин без втрат
+    terminal_to_store = calculate_terminal_to_store_flows(flow_graph, network)
+    assert sum(terminal_to_store.values()) == 115
+
+    # Цикли потоку не потрапляють у шляхи
+    cyclic = {"s": {"a": 3}, "a": {"b": 5}, "b": {"a": 2, "t": 3}}
+    assert decompose_flow(cyclic, "s", "t") == [(["s", "a", "b", "t"], 3)]
+    print(f"✓ Розклад потоку: {len(paths)} шляхів, сума 115")
+
+
+def test_min_cost_max_flow():
+    """Тест максимального потоку мінімальної вартості."""
+    from task1_max_flow import MaxFlowNetwork
+
+    network = MaxFlowNetwork()
+    network.add_edge("Термінал", "Склад A", 10, cost=1)
+    network.add_edge("Термінал", "Склад B", 10, cost=4)
+    network.add_edge("Склад A", "Магазин", 6, cost=1)
+    network.add_edge("Склад B", "Магазин", 10, cost=1)
+    network.add_edge("Склад A", "Склад B", 5, cost=1)
+
+    max_flow, total_cost, flow_graph = network.min_cost_max_flow("Термінал", "Магазин")
+    assert max_flow == network.edmonds_karp("Термінал", "Магазин")[0] == 16
+    # 6 через A (вартість 2), 4 через A -> B (3), 6 через B (5)
+    assert total_cost == 6 * 2 + 4 * 3 + 6 * 5, f"Отримано вартість {total_cost}"
+    assert flow_graph["Склад A"]["Склад B"] == 4
+    print(f"✓ Мін. вартість: потік {max_flow}, вартість {total_cost}")
+
+
+def test_edge_list_loaders():
+    """Тест потокового завантаження списків ребер."""
+    import os
+    import tempfile
+    import tracemalloc
+    from array import array
+    from task1_max_flow import (
+        MaxFlowNetwork, INFINITE_CAPACITY, BINARY_EDGES_HEADER, BINARY_EDGES_MAGIC
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "edges.csv")
+        with open(csv_path, "w", encoding="utf-8") as file:
+            file.write("from,to,capacity\n")
+            file.write("Термінал 1,Склад 1,25\nСклад 1,Магазин 1,15\n")
+            file.write("Склад 1,Магазин 2,10\nМагазин 1,Стік,inf\nМагазин 2,Стік,inf\n")
+
+        # Малий блок перевіряє рядки, розірвані між блоками
+        network = MaxFlowNetwork.from_edge_list(csv_path, chunk_size=7)
+        assert network.edmonds_karp("Термінал 1", "Стік")[0] == 25
+        assert network.graph["Склад 1"]["Магазин 2"] == 10
+
+        # Повторні рядки об'єднуються в одне ребро із сумарною ємністю
+        duplicates_path = os.path.join(directory, "duplicates.csv")
+        with open(duplicates_path, "w", encoding="utf-8") as file:
+            file.write("A,B,4\nA,B,5\nB,T,inf\n")
+        duplicates = MaxFlowNetwork.from_edge_list(duplicates_path)
+        assert duplicates.graph["A"]["B"] == 9 and duplicates.edmonds_karp("A", "T")[0] == 9
+        duplicates.add_edge("A", "B", 1)
+        assert duplicates.edmonds_karp("A", "T")[0] == 1
+
+        # Пошкоджений перший рядок даних не мовчки пропускається як заголовок
+        for content in ["A,B,12x\nB,T,5\n", "A,B,-3\nB,T,5\n", "A,B,\nB,T,5\n"]:
+            with open(duplicates_path, "w", encoding="utf-8") as file:
+                file.write(content)
+            try:
+                MaxFlowNetwork.from_edge_list(duplicates_path)
+                assert False, f"Має бути ValueError для {content!r}"
+            except ValueError:
+                pass
+
+        binary_path = os.path.join(directory, "edges.bin")
+        network.to_binary_edges(binary_path)
+        loaded = MaxFlowNetwork.from_binary_edges(binary_path)
+        source, sink = str(network._index["Термінал 1"]), str(network._index["Стік"])
+        assert loaded.edmonds_karp(source, sink)[0] == 25
+
+        # Об'єднання повторів не тримає об'єкта Python на кожне ребро:
+        # пік пам'яті обмежений кількома розмірами стовпців ребер
+        num_edges = 20000
+        tails = array('q', (k % 100 for k in range(num_edges)))
+        heads = array('q', ((k // 2 + 1) % 100 for k in range(num_edges)))
+        mixed = array('q', [3]) * num_edges
+        mixed[0] = INFINITE_CAPACITY  # нескінченна ємність поглинає решту повторів
+        for caps in (array('q', [2]) * num_edges, mixed):
+            with open(binary_path, "wb") as file:
+                file.write(BINARY_EDGES_HEADER.pack(BINARY_EDGES_MAGIC, 100, num_edges))
+                for column in (tails, heads, caps, array('q', bytes(8 * num_edges))):
+                    column.tofile(file)
+            tracemalloc.start()
+            merged = MaxFlowNetwork.from_binary_edges(binary_path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert peak < 2 * 4 * 8 * num_edges, f"Пік пам'яті {peak} Б"
+            expected = {(u, v) for u, v in zip(tails, heads)}
+            assert len(merged._tails) == len(expected) < num_edges
+            assert merged._edge_ids is None
+            # Кожне ребро повторюється кожні 200 рядків
+            assert merged.graph["0"]["1"] == (float('inf') if caps is mixed else 200)
+        assert sorted(set(merged._caps)) == [INFINITE_CAPACITY, 300]
+
+        # Повтори з різною вартістю, вершини поза межами, від'ємні ємності
+        # та обрізаний заголовок відхиляються з ValueError
+        for columns in ([[0, 0], [1, 1], [5, 5], [1, 2]], [[0, 0], [1, 2], [5, 5], [0, 0]],
+                        [[0, -1], [1, 0], [5, 5], [0, 0]], [[0, 1], [1, 0], [5, -2], [0, 0]]):
+            with open(binary_path, "wb") as file:
+                file.write(BINARY_EDGES_HEADER.pack(BINARY_EDGES_MAGIC, 2, 2))
+                for column in columns:
+                    array('q', column).tofile(file)
+            try:
+                MaxFlowNetwork.from_binary_edges(binary_path)
+                assert False, f"Має бути ValueError для {columns}"
+            except ValueError:
+                pass
+        with open(binary_path, "wb") as file:
+            file.write(BINARY_EDGES_MAGIC)
+        try:
+            MaxFlowNetwork.from_binary_edges(binary_path)
+            assert False, "Має бути ValueError"
+        except ValueError:
+            pass
+    print("✓ Завантаження CSV та двійкового списку ребер")
+
+
+def test_snapshot():
+    """Тест збереження та завантаження знімка розв'язаної мережі."""
+    import os
+    import tempfile
+    from task1_max_flow import (
+        IncrementalMaxFlow, save_snapshot, load_snapshot,
+        create_logistics_network, add_super_source_and_sink
+    )
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+    solver = IncrementalMaxFlow(network, super_source, super_sink)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "network.snapshot")
+        save_snapshot(path, network, solver)
+        loaded_network, loaded_solver = load_snapshot(path)
+
+        # Обрізаний знімок відхиляється до копіювання стовпців
+        truncated = os.path.join(directory, "truncated.snapshot")
+        with open(path, "rb") as source, open(truncated, "wb") as target:
+            target.write(source.read()[:-200])
+        try:
+            load_snapshot(truncated)
+            assert False, "Має бути ValueError"
+        except ValueError:
+            pass
+
+    assert loaded_network.graph == network.graph
+    assert loaded_solver.max_flow == 115
+    assert loaded_solver.flow_graph() == solver.flow_graph()
+    # Відновлений стан готовий до інкрементальних змін
+    assert loaded_solver.set_capacity("Термінал 2", "Склад 4", 40) == 125
+    print("✓ Знімок: мережа та розв'язок відновлені")
+
+
+def test_multi_source_max_flow():
+    """Тест потоку між множинами джерел і стоків без супер-вершин."""
+    from task1_max_flow import create_logistics_network
+
+    network = create_logistics_network()
+    terminals, stores = network.boundary_nodes()
+    assert terminals == ["Термінал 1", "Термінал 2"]
+    assert len(stores) == 14
+
+    max_flow, flow_graph = network.multi_source_max_flow(terminals, stores)
+    assert max_flow == 115 and isinstance(max_flow, int)
+    assert "Супер-Джерело" not in network.nodes
+
+    # Обмеження пропозиції та попиту
+    limited, _ = network.multi_source_max_flow(terminals, stores, supplies={"Термінал 1": 40})
+    assert limited == 95, f"Очікувався потік 95, отримано {limited}"
+    limited, flow_graph = network.multi_source_max_flow(terminals, stores, demands={"Магазин 10": 5, "Магазин 1": 0})
+    assert "Магазин 1" not in flow_graph.get("Склад 1", {})
+    assert limited == 115 and flow_graph["Склад 4"].get("Магазин 10", 0) <= 5
+    print("✓ Кілька джерел і стоків: потік = 115 одиниць")
+
+
+def test_super_nodes_unbounded():
+    """Тест: допоміжні ребра супер-вершин не обмежують потік після змін мережі."""
+    from task1_max_flow import create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+    assert network.solve(super_source, super_sink).max_flow == 115
+
+    # Розширення маршрутів після додавання супер-вершин
+    network.add_edge("Термінал 1", "Склад 1", 1000)
+    network.add_edge("Склад 1", "Магазин 1", 1000)
+    max_flow = network.solve(super_source, super_sink).max_flow
+    assert max_flow == 1090, f"Очікувався потік 1090, отримано {max_flow}"
+    print(f"✓ Супер-вершини після розширення маршрутів: потік = {max_flow} одиниць")
+
+
+def test_benchmark_generators():
+    """Тест генераторів бенчмарку: усі алгоритми дають однаковий потік."""
+    from benchmark_max_flow import GENERATORS, SOLVERS, run_benchmarks, find_regressions
+
+    results = run_benchmarks([300], SOLVERS, list(GENERATORS), seed=7)
+    for generator in GENERATORS:
+        flows = {r["max_flow"] for r in results if r["generator"] == generator}
+        assert len(flows) == 1 and flows.pop() > 0, f"Різні потоки для {generator}"
+    assert find_regressions(results, results, tolerance=0.0) == []
+    print("✓ Бенчмарк: генератори та порівняння з базовими результатами")
+
+
+def test_solve_stats():
+    """Тест інструментування: лічильники, час фаз і зворотний виклик прогресу."""
+    from task1_max_flow import create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+
+    assert len(network.edmonds_karp(super_source, super_sink)) == 2
+
+    progress = []
+    max_flow, flow_graph, stats = network.edmonds_karp(
+        super_source, super_sink, collect_stats=True, progress=lambda s: progress.append(s.max_flow)
+    )
+    assert max_flow == 115 and stats.max_flow == 115
+    assert stats.bfs_runs == stats.augmenting_paths + 1
+    assert stats.edges_scanned > 0 and stats.average_path_length >= 3
+    assert set(stats.phase_times) == {"bfs", "bottleneck", "update"}
+    assert len(progress) == stats.augmenting_paths and progress[-1] == 115
+    assert progress == sorted(progress)
+
+    for algorithm in ("dinic", "push_relabel"):
+        max_flow, _, stats = network.solve(super_source, super_sink, algorithm, collect_stats=True)
+        assert max_flow == 115 and stats.algorithm == algorithm and stats.bfs_runs > 0
+    print("✓ Статистика розв'язання: лічильники, фази та прогрес")
+
+
+def test_flow_result():
+    """Тест FlowResult: сумісність із кортежем, агрегати та потокові звіти."""
+    import csv
+    import io
+    import json
+    from task1_max_flow import FlowResult, create_logistics_network
+
+    network = create_logistics_network()
+    terminals, stores = network.boundary_nodes()
+    result = network.multi_source_max_flow(terminals, stores)
+    assert isinstance(result, FlowResult)
+    # Індекс 0 не будує словник потоків
+    assert result[0] == result[-2] == 115 and result._flow_graph is None
+    max_flow, flow_graph = result
+    assert max_flow == result.max_flow == result[0] == 115 and flow_graph is result.flow_graph
+
+    assert sum(result.outflow(terminal) for terminal in terminals) == 115
+    assert sum(result.inflow(store) for store in stores) == 115
+    for node in network.nodes - set(terminals) - set(stores):
+        assert result.inflow(node) == result.outflow(node)
+    assert result.inflow("Термінал 1") == 0 and result.outflow("Невідома вершина") == 0
+
+    capacities = [capacity for _, _, capacity, _, _ in result.lowest_capacity_edges()]
+    assert capacities == sorted(capacities) and len(capacities) == 20
+    assert all(flow == capacity for _, _, capacity, flow, _ in result.saturated_edges())
+    assert ("Термінал 2", "Склад 4", 30, 30, 100.0) in result.saturated_edges()
+    assert [edge[0] for edge in result.in_edges("Магазин 1")] == ["Склад 1"]
+
+    # Нові вершини мережі не потрапляють у вже повернений результат
+    network.add_edge("Магазин 1", "Нова вершина", 5)
+    assert result.inflow("Нова вершина") == 0 and result.in_edges("Нова вершина") == []
+    assert "Нова вершина" not in result._index
+
+    with_stats = network.solve("Термінал 1", "Магазин 1", collect_stats=True)
+    assert len(with_stats) == 3 and with_stats[2] is with_stats.stats
+
+    stream = io.StringIO(newline="")
+    result.write_csv(stream)
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert len(rows) == 20 and sum(int(row["flow"]) for row in rows if row["from"] in terminals) == 115
+
+    stream = io.StringIO()
+    result.write_jsonl(stream)
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[0] == {"from": "Термінал 1", "to": "Склад 1", "capacity": 25, "flow": 25, "utilization": 100.0}
+    print("✓ FlowResult: агрегати, індекси та звіти CSV/JSONL")
+
+
+def test_flow_cache():
+    """Тест кешу результатів: повторні розв'язання, інвалідація та дисковий рівень."""
+    import tempfile
+    from task1_max_flow import FlowCache, create_logistics_network
+
+    network = create_logistics_network()
+    hash_before = network.content_hash()
+    assert hash_before == create_logistics_network().content_hash()
+
+    with tempfile.TemporaryDirectory() as directory:
+        network.result_cache = FlowCache(max_entries=2, directory=directory)
+        first = network.edmonds_karp("Термінал 1", "Магазин 1")
+        assert network.edmonds_karp("Термінал 1", "Магазин 1") is first
+        assert network.result_cache.hits == 1
+
+        # Зміна мережі дає новий ключ
+        network.add_edge("Склад 2", "Магазин 1", 5)
+        assert network.content_hash() != hash_before
+        assert network.edmonds_karp("Термінал 1", "Магазин 1").max_flow == first.max_flow + 5
+
+        # Витіснений з пам'яті результат читається з диска
+        network.edmonds_karp("Термінал 2", "Магазин 1")
+        network.edmonds_karp("Термінал 2", "Магазин 2")
+        network.result_cache.clear()
+        max_flow, flow_graph = network.edmonds_karp("Термінал 2", "Магазин 2")
+        assert network.result_cache.hits == 2 and len(network.result_cache) == 1
+        assert max_flow == network.edmonds_karp("Термінал 2", "Магазин 2", collect_stats=True).max_flow
+    print("✓ Кеш результатів: LRU, інвалідація та диск")
+
+
+def test_edge_sensitivity():
+    """Тест чутливості ребер: приріст збігається з повторним розв'язанням."""
+    from task1_max_flow import create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+    sensitivity = network.edge_sensitivity(super_source, super_sink, increase=10)
+    assert len(sensitivity) == len(network._tails)
+
+    critical = {(u, v): gain for u, v, is_critical, gain in sensitivity if is_critical}
+    assert set(critical) <= set(network.min_cut(super_source, super_sink)[1])
+    for from_node, to_node, is_critical, gain in sensitivity[:8]:
+        capacity = network.graph[from_node][to_node]
+        network.add_edge(from_node, to_node, capacity + 10)
+        assert network.edmonds_karp(super_source, super_sink)[0] == 115 + gain, f"{from_node} -> {to_node}"
+        network.add_edge(from_node, to_node, capacity)
+        assert is_critical == (gain > 0)
+    assert critical[("Термінал 2", "Склад 4")] == 10
+    print(f"✓ Чутливість ребер: {len(critical)} критичних маршрутів")
+
+
+def test_capacity_scaling():
+    """Тест масштабування ємностей."""
+    from task1_max_flow import MaxFlowNetwork, create_logistics_network, add_super_source_and_sink
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+    assert network.capacity_scaling(super_source, super_sink)[0] == 115
+
+    # Один широкий маршрут і багато вузьких: кожен шлях доповнюється один раз
+    network = MaxFlowNetwork()
+    network.add_edge("S", "A", 100000)
+    network.add_edge("A", "B", 100000)
+    network.add_edge("B", "T", 100000)
+    for i in range(20):
+        network.add_edge("S", f"x{i}", 1)
+        network.add_edge(f"x{i}", "T", 1)
+
+    flow, _, stats = network.capacity_scaling("S", "T", collect_stats=True)
+    assert flow == network.edmonds_karp("S", "T")[0] == 100020
+    assert stats.augmenting_paths == 21
+    _, _, source_side, cut_edges = network.solve_with_min_cut("S", "T", "capacity_scaling")
+    assert sum(network.graph[u][v] for u, v in cut_edges) == 100020
+    print(f"✓ Масштабування ємностей: потік = {flow} одиниць, "
+          f"доповнень {stats.augmenting_paths}")
+
+
+def test_vectorized_bfs():
+    """Тест пошуку в ширину по фронтах (NumPy): ті самі потоки та розрізи."""
+    import task1_max_flow
+    from task1_max_flow import create_logistics_network, add_super_source_and_sink
+
+    if task1_max_flow.np is None:
+        print("✓ Векторний BFS: NumPy не встановлено, тест пропущено")
+        return
+
+    network = create_logistics_network()
+    super_source, super_sink = add_super_source_and_sink(network)
+
+    for algorithm in ("edmonds_karp", "dinic"):
+        context = network._context(super_source, super_sink)
+        context.vectorized = True
+        assert network._run_solver(context, algorithm) == 115
+        assert sum(network._collect_flows(context)[super_source].values()) == 115
+        source_side, cut_edges = network._min_cut(context)
+        assert sum(network.graph[u][v] for u, v in cut_edges) == 115
+    print("✓ Векторний BFS: потік = 115 одиниць")
+
+
+def test_gomory_hu_tree():
+    """Тест дерева Гоморі-Ху: запити збігаються з окремими розв'язаннями."""
+    from task1_max_flow import MaxFlowNetwork
+
+    network = MaxFlowNetwork()
+    for u, v, capacity in [("A", "B", 10), ("B", "A", 3), ("A", "C", 4), ("B", "C", 5),
+                           ("B", "D", 2), ("C", "D", 8), ("D", "E", 6)]:
+        network.add_edge(u, v, capacity)
+
+    # Еталон: ті самі ребра в обидва боки
+    undirected = MaxFlowNetwork()
+    for u, v, capacity in [("A", "B", 13), ("A", "C", 4), ("B", "C", 5),
+                           ("B", "D", 2), ("C", "D", 8), ("D", "E", 6)]:
+        undirected.add_edge(u, v, capacity)
+        undirected.add_edge(v, u, capacity)
+
+    for workers in (1, 2):
+        tree = network.gomory_hu_tree(max_workers=workers)
+        assert len(tree.edges()) == 4
+        for u in "ABCDE":
+            for v in "ABCDE":
+                if u < v:
+                    expected = undirected.edmonds_karp(u, v)[0]
+                    assert tree.max_flow(u, v) == expected, f"{u}-{v}: {tree.max_flow(u, v)} != {expected}"
+
+    value, side = tree.min_cut("A", "E")
+    assert value == 6 and side == {"A", "B", "C", "D"}
+    print("✓ Дерево Гоморі-Ху: потоки між усіма парами")
+
+
 def test_task2():
     """Тест завдання 2."""
     print("\n" + "="*70)
@@ -89,6 +722,239 @@ def test_task2():
     return True
 
 
+def test_suffix_index():
+    """Тест індексу суфіксів у Homework."""
+    print("\n" + "="*70)
+    print("ТЕСТ: Індекс суфіксів")
+    print("="*70)
+    
+    import random
+    from task2_trie import Homework
+    
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 6))) for _ in range(500)]
+    plain = Homework()
+    indexed = Homework(suffix_index=True)
+    for i, word in enumerate(words):
+        plain.put(word, i)
+        indexed.put(word, i)
+    # Повторне додавання та значення None не змінюють лічильники
+    indexed.put(words[0], None)
+    indexed.put(words[0], 1)
+    
+    unique = set(words)
+    for pattern in ["a", "b", "ab", "cba", "aaaa", "abcabc", "x"]:
+        expected = sum(word.endswith(pattern) for word in unique)
+        assert indexed.count_words_with_suffix(pattern) == expected, pattern
+        assert plain.count_words_with_suffix(pattern) == expected, pattern
+    print("✓ Результати з індексом збігаються з повним перебором")
+    
+    for invalid, error in [(123, TypeError), ("", ValueError)]:
+        try:
+            indexed.count_words_with_suffix(invalid)
+            assert False, f"Має бути {error.__name__}"
+        except error:
+            pass
+    try:
+        indexed.put(5, 0)
+        assert False, "Має бути TypeError"
+    except TypeError:
+        pass
+    assert indexed.count_words_with_suffix("a") == sum(w.endswith("a") for w in unique)
+    print("✓ Обробка помилок не псує індекс")
+    
+    return True
+
+
+def test_compact_trie_node():
+    """Тест компактного представлення вузлів дерева."""
+    print("\n" + "="*70)
+    print("ТЕСТ: Компактні вузли префіксного дерева")
+    print("="*70)
+    
+    import random
+    from trie import Trie, TrieNode
+    
+    node = TrieNode()
+    assert not hasattr(node, "__dict__"), "Вузол має використовувати __slots__"
+    assert node._nodes is None and node.children == {}
+    a = node.add_child("a")
+    assert node._nodes is a, "Єдиний нащадок зберігається без контейнера"
+    assert node.add_child("a") is a and node.child("b") is None
+    b = node.add_child("b")
+    c = node.add_child("c")
+    assert node.children == {"a": a, "b": b, "c": c}
+    assert [char for char, _ in node.child_items()] == ["a", "b", "c"]
+    assert node.child("c") is c and node.child("d") is None
+    print("✓ Лист без контейнера, один нащадок inline, кілька - у списку")
+    
+    rng = random.Random(5)
+    reference = {}
+    trie = Trie()
+    for i in range(2000):
+        key = "".join(rng.choice("abcdé日") for _ in range(rng.randint(0, 8)))
+        trie.put(key, i)
+        reference[key] = i
+    assert all(trie.get(key) == value for key, value in reference.items())
+    assert sorted(trie.keys()) == sorted(reference)
+    assert trie.get("zz") is None and not trie.contains("abcdeabcde")
+    print("✓ put/get/keys збігаються зі словником-еталоном")
+
+    # Бенчмарк вимірює колишнє й компактне розміщення на тих самих ключах
+    from benchmark_trie import compare_layouts, run_benchmarks
+    results = run_benchmarks(500, ["words"], ["dict", "trie"], seed=3)
+    assert results[0]["nodes"] == results[1]["nodes"]
+    [(_, before, after)] = compare_layouts(results)
+    assert after < before, f"{after:.1f} Б/симв проти {before:.1f} Б/симв"
+    print(f"✓ Пам'ять на символ: {before:.1f} -> {after:.1f} Б")
+
+    return True
+
+
+def test_double_array_trie():
+    """Тест незмінного дерева на подвійному масиві."""
+    print("\n" + "="*70)
+    print("ТЕСТ: Подвійний масив (double-array trie)")
+    print("="*70)
+    
+    import random
+    from array import array
+    from trie import Trie
+    from task2_trie import Homework
+    from double_array_trie import DoubleArrayTrie
+    
+    trie = Homework()
+    words = ["apple", "application", "banana", "cat"]
+    for i, word in enumerate(words):
+        trie.put(word, i)
+    frozen = DoubleArrayTrie(trie)
+    assert isinstance(frozen._base, array) and frozen._base.typecode == "i"
+    assert [frozen.get(word) for word in words] == [0, 1, 2, 3]
+    assert frozen.get("app") is None and not frozen.contains("ca") and "cat" in frozen
+    assert [frozen.has_prefix(p) for p in ["app", "bat", "ban", "ca"]] == [True, False, True, True]
+    assert [frozen.count_words_with_suffix(p) for p in ["e", "ion", "a", "at"]] == [1, 1, 1, 1]
+    assert frozen.keys() == sorted(words) and len(frozen) == 4
+    print("✓ Базові тести завдання проходять на подвійному масиві")
+    
+    rng = random.Random(3)
+    for suffix_index in (False, True):
+        source = Homework(suffix_index=suffix_index)
+        reference = {}
+        for i in range(300):
+            key = "".join(rng.choice("abcé日") for _ in range(rng.randint(0, 6)))
+            source.put(key, i)
+            reference[key] = i
+        for frozen in (DoubleArrayTrie(source), DoubleArrayTrie(source, suffix_index=not suffix_index)):
+            assert list(frozen) == sorted(reference)
+            probes = list(reference) + ["q", "aq", "日日日日日日日"]
+            assert all(frozen.get(key) == source.get(key) for key in probes)
+            for pattern in ["a", "é", "b日", "ccc", "q"]:
+                assert frozen.count_words_with_prefix(pattern) == source.count_words_with_prefix(pattern)
+                assert frozen.count_words_with_suffix(pattern) == sum(k.endswith(pattern) for k in reference)
+    assert DoubleArrayTrie(Trie()).keys() == []
+    print("✓ Результати збігаються з Homework (з індексом суфіксів і без)")
+    
+    for call, argument, error in [
+        (DoubleArrayTrie, {}, TypeError),
+        (frozen.get, 1, TypeError),
+        (frozen.has_prefix, "", ValueError),
+        (frozen.count_words_with_suffix, None, TypeError),
+    ]:
+        try:
+            call(argument)
+            assert False, f"Має бути {error.__name__}"
+        except error:
+            pass
+    print("✓ Обробка помилок: працює коректно")
+    
+    return True
+
+
+def test_radix_trie():
+    """Тест стисненого (radix) префіксного дерева."""
+    print("\n" + "="*70)
+    print("ТЕСТ: Стиснене префіксне дерево (radix)")
+    print("="*70)
+    
+    import random
+    from task2_trie import Homework
+    from radix_trie import RadixTrie
+    
+    trie = RadixTrie()
+    trie.put("user@example.com", 1)
+    assert trie.root.child("u").label == "user@example.com", "Ключ має займати одне ребро"
+    trie.put("user@example.org", 2)
+    trie.put("user", 3)
+    middle = trie.root.child("u")
+    assert middle.label == "user" and middle.is_end_of_word
+    assert middle.child("@").label == "@example."
+    assert [trie.get(k) for k in ["user@example.com", "user@example.org", "user", "use"]] == [1, 2, 3, None]
+    assert trie.count_words_with_prefix("user@exa") == 2 and not trie.has_prefix("usx")
+    print("✓ Ребра з мітками розщеплюються при додаванні")
+    
+    rng = random.Random(9)
+    radix = RadixTrie()
+    reference = Homework()
+    for i in range(500):
+        key = "".join(rng.choice("abé") for _ in range(rng.randint(0, 7)))
+        value = None if i % 17 == 0 else i
+        radix.put(key, value)
+        reference.put(key, value)
+    assert radix.keys() == reference.keys(), "Порядок keys має збігатися з Trie"
+    probes = reference.keys() + ["abababab", "q", "éé"]
+    assert all(radix.get(k) == reference.get(k) and radix.contains(k) == reference.contains(k)
+               for k in probes)
+    assert all(radix.count_words_with_prefix(k) == reference.count_words_with_prefix(k)
+               for k in probes if k)
+    print("✓ put/get/contains/keys/has_prefix збігаються з Homework")
+    
+    for call, error in [(lambda: radix.put(1, 0), TypeError), (lambda: radix.get(None), TypeError),
+                        (lambda: radix.has_prefix(""), ValueError)]:
+        try:
+            call()
+            assert False, f"Має бути {error.__name__}"
+        except error:
+            pass
+    print("✓ Обробка помилок: працює коректно")
+    
+    return True
+
+
+def test_prefix_counts():
+    """Тест лічильників слів у вузлах дерева."""
+    print("\n" + "="*70)
+    print("ТЕСТ: Лічильники слів для префіксів")
+    print("="*70)
+    
+    import random
+    from task2_trie import Homework
+    
+    rng = random.Random(11)
+    words = ["".join(rng.choice("xyz") for _ in range(rng.randint(0, 5))) for _ in range(400)]
+    trie = Homework()
+    for i, word in enumerate(words):
+        trie.put(word, i)
+    trie.put(words[1], None)
+    
+    unique = set(words)
+    assert trie.root.word_count == len(unique)
+    for prefix in ["x", "y", "xy", "zzz", "xyzxy", "a"]:
+        expected = sum(word.startswith(prefix) for word in unique)
+        assert trie.count_words_with_prefix(prefix) == expected, prefix
+        assert trie.has_prefix(prefix) == (expected > 0), prefix
+    print("✓ count_words_with_prefix та has_prefix збігаються з повним перебором")
+    
+    for invalid, error in [(None, TypeError), ("", ValueError)]:
+        try:
+            trie.count_words_with_prefix(invalid)
+            assert False, f"Має бути {error.__name__}"
+        except error:
+            pass
+    print("✓ Обробка помилок: працює коректно")
+    
+    return True
+
+
 if __name__ == "__main__":
     print("\n" + "="*70)
     print("ФІНАЛЬНА ПЕРЕВІРКА ДОМАШНЬОГО ЗАВДАННЯ")
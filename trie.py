@@ -3,13 +3,99 @@
 """
 
 class TrieNode:
-    """Вузол префіксного дерева."""
+    """
+    Вузол префіксного дерева.
+    
+    Дочірні вузли зберігаються компактно: лист не має контейнера взагалі,
+    єдиний нащадок зберігається безпосередньо у вузлі, а кілька нащадків -
+    як рядок символів переходів і список вузлів у тому самому порядку.
+    """
+    
+    __slots__ = ("_chars", "_nodes", "is_end_of_word", "value", "word_count")
     
     def __init__(self):
         """Ініціалізація вузла."""
-        self.children = {}
+        self._chars = ""  # символи переходів у порядку додавання
+        self._nodes = None  # None, єдиний TrieNode або список вузлів
         self.is_end_of_word = False
         self.value = None
+        self.word_count = 0  # кількість слів у піддереві, включно з цим вузлом
+    
+    def child(self, char: str):
+        """
+        Повертає дочірній вузол за символом.
+        
+        Args:
+            char: Символ переходу
+            
+        Returns:
+            Дочірній вузол або None, якщо переходу немає
+        """
+        chars = self._chars
+        if chars == char:
+            return self._nodes
+        index = chars.find(char)
+        if index < 0:
+            return None
+        return self._nodes[index]
+    
+    def add_child(self, char: str) -> "TrieNode":
+        """
+        Повертає дочірній вузол за символом, створюючи його за потреби.
+        
+        Args:
+            char: Символ переходу
+            
+        Returns:
+            Наявний або новий дочірній вузол
+        """
+        node = self.child(char)
+        if node is None:
+            node = self._append_child(char)
+        return node
+    
+    def _append_child(self, char: str) -> "TrieNode":
+        """
+        Додає новий дочірній вузол без перевірки наявності переходу.
+        
+        Args:
+            char: Символ переходу, якого ще немає у вузлі
+            
+        Returns:
+            Новий дочірній вузол
+        """
+        node = TrieNode()
+        if not self._chars:
+            self._nodes = node
+        elif len(self._chars) == 1:
+            self._nodes = [self._nodes, node]
+        else:
+            self._nodes.append(node)
+        self._chars += char
+        return node
+    
+    def child_items(self):
+        """
+        Повертає пари (символ, дочірній вузол) у порядку додавання.
+        
+        Returns:
+            Ітерований набір пар
+        """
+        if len(self._chars) == 1:
+            return ((self._chars, self._nodes),)
+        if not self._chars:
+            return ()
+        return zip(self._chars, self._nodes)
+    
+    @property
+    def children(self) -> dict:
+        """
+        Словник дочірніх вузлів {символ: вузол}.
+        
+        Будується на вимогу для сумісності; зміни словника не впливають
+        на вузол, для додавання використовуйте add_child.
+        """
+        return dict(self.child_items())
 
 
 class Trie:
@@ -23,6 +109,9 @@ class Trie:
         """
         Додає ключ-значення до дерева.
         
+        Для нового ключа лічильники слів збільшуються на всьому шляху від
+        кореня; повторне додавання лише оновлює значення.
+        
         Args:
             key: Рядок-ключ
             value: Значення для збереження
@@ -31,11 +120,19 @@ class Trie:
             raise TypeError("Ключ повинен бути рядком")
         
         node = self.root
+        path = [node]
         for char in key:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
+            chars = node._chars
+            if chars == char:
+                node = node._nodes
+            else:
+                index = chars.find(char)
+                node = node._append_child(char) if index < 0 else node._nodes[index]
+            path.append(node)
         
+        if not node.is_end_of_word:
+            for visited in path:
+                visited.word_count += 1
         node.is_end_of_word = True
         node.value = value
     
@@ -54,9 +151,15 @@ class Trie:
         
         node = self.root
         for char in key:
-            if char not in node.children:
+            # Перехід вбудовано в цикл: це найгарячіший шлях пошуку
+            chars = node._chars
+            if chars == char:
+                node = node._nodes
+                continue
+            index = chars.find(char)
+            if index < 0:
                 return None
-            node = node.children[char]
+            node = node._nodes[index]
         
         return node.value if node.is_end_of_word else None
     
@@ -95,5 +198,5 @@ class Trie:
         if node.is_end_of_word:
             result.append(prefix)
         
-        for char, child_node in node.children.items():
+        for char, child_node in node.child_items():
             self._collect_keys(child_node, prefix + char, result)